@@ -1,16 +1,31 @@
 """PyGoL - Python Game of Life"""
 from pygol.game import Game
-from pygol.utils import parse_rle
+from pygol.utils import Matrix, parse_rle
 from pygol.gui import pygame, terminal
 
 from pygol.cli import ARGS
 
-if ARGS.file:
-    CONW = Game(**parse_rle(ARGS.file), wrap=ARGS.wrap).pad(ARGS.pad)
+if ARGS.resume:
+    CONW = Game.load(ARGS.checkpoint, engine=ARGS.engine)
+elif ARGS.file:
+    CONW = Game(**parse_rle(ARGS.file), wrap=ARGS.wrap,
+                engine=ARGS.engine).pad(ARGS.pad)
 else:
-    CONW = Game(width=ARGS.pad * 2, height=ARGS.pad * 2, wrap=ARGS.wrap,
-                rule=ARGS.rule)
+    SEED = Matrix(ARGS.pad * 2).fill_random(density=ARGS.density,
+                                            random_state=ARGS.random_state,
+                                            symmetry=ARGS.symmetry)
+    CONW = Game(width=ARGS.pad * 2, height=ARGS.pad * 2, seed=SEED.matrix,
+                wrap=ARGS.wrap, rule=ARGS.rule, engine=ARGS.engine)
+
+if ARGS.autosize:
+    CONW.autosize(ARGS.pad)
 
 DISPLAY = pygame if ARGS.display == "pygame" else terminal
 
-CONW.pipe(DISPLAY).run(ARGS.iter, delay=ARGS.delay)
+CHECKPOINT = ARGS.checkpoint if ARGS.checkpoint_every else None
+
+CONW.skip(ARGS.skip).pipe(DISPLAY).run(ARGS.iter, delay=ARGS.delay,
+                                        stop=ARGS.stop, checkpoint=CHECKPOINT,
+                                        checkpoint_every=ARGS.checkpoint_every,
+                                        stride=ARGS.stride, fps=ARGS.fps,
+                                        record=ARGS.stats)
@@ -17,3 +17,35 @@ PARSER.add_argument('-w', '--wrap', type=bool, default=True,
                     help='Whether or not to wrap simulation at edges; default is True')
 PARSER.add_argument('-r', '--rule', default='B3/S23',
                     help="Rule string used for simulation; default is B3/S23")
+PARSER.add_argument('-e', '--engine', choices=['python', 'numpy', 'bitpacked', 'hashlife',
+                                           'active', 'sparse', 'parallel', 'mapped'],
+                    default='python',
+                    help="Engine used to compute generations; default is python")
+PARSER.add_argument('-s', '--skip', type=int, default=0,
+                    help='Number of generations to skip before displaying the simulation; '
+                         'default is 0')
+PARSER.add_argument('--stride', type=int,
+                    help='Only display every n-th generation; default is every generation')
+PARSER.add_argument('--fps', type=float,
+                    help='Target display frame rate, computing generations in between; '
+                         'default is one generation per frame')
+PARSER.add_argument('--stop', action='store_true',
+                    help='Stop the simulation once it becomes periodic')
+PARSER.add_argument('-c', '--checkpoint', default='checkpoint.pygol',
+                    help='Path of the checkpoint file; default is checkpoint.pygol')
+PARSER.add_argument('--checkpoint-every', type=int, default=0,
+                    help='Number of generations between checkpoints; default is 0 (no checkpoints)')
+PARSER.add_argument('--resume', action='store_true',
+                    help='Resume the simulation from the checkpoint file')
+PARSER.add_argument('--stats',
+                    help='Path of a CSV file to record the statistics of every generation to')
+PARSER.add_argument('--autosize', action='store_true',
+                    help='Grow and crop grids that do not wrap to follow the pattern, '
+                         'keeping --pad empty cells around it')
+PARSER.add_argument('--density', type=float,
+                    help='Fraction of living cells in random grids; default is 0.5')
+PARSER.add_argument('--symmetry', choices=['C1', 'C2', 'C4', 'D8'],
+                    help='Symmetry of random grids; default is C1 (no symmetry)')
+PARSER.add_argument('--random-state', type=int,
+                    help='Seed of the random generator filling random grids, '
+                         'to repeat a simulation')
@@ -1,2 +1,3 @@
 """PyGoL Main Game Module"""
 from .conway import Game
+from .batch import Batch
@@ -0,0 +1,226 @@
+"""PyGoL batched simulation of independent universes"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Sequence, Union
+
+from .compile import transition_table
+from .conway import Game
+from .engines.vectorized import neighbor_counts
+from .rules import Signature as Rule
+from .rules import conways_life, resolve
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+class Batch:
+    """Batch of independent Game of Life universes of the same size.
+
+    All universes are stored in one contiguous ``uint8`` array of shape
+    ``(count, height, width)`` and advanced together by a single vectorized
+    kernel, amortizing the Python overhead over the whole batch. Every universe
+    can use its own rule.
+
+    Parameters
+    ----------
+    width, height: int
+        Width and height of every universe.
+    count: int, optional
+        Amount of universes. Defaults to the amount of seeds, or ``1`` if no
+        seeds are given.
+    seeds: `Any`, optional
+        Seeds of the universes, as a sequence of grids or an array of shape
+        ``(count, height, width)``. Must only contain ``0`` for dead cells and
+        ``1`` for alive cells. If not specified, every universe is filled
+        randomly.
+    rules: `union` [`Rule Func`, str, `sequence` [`union` [`Rule Func`, str]]], optional
+        Rule string or function used by all universes, or one rule per
+        universe. Defaults to the standard ``Conway's Game of Life`` rule.
+    wrap: bool, optional
+        Whether to wrap the universes around the edges. Defaults to ``True``.
+    random_state: int, optional
+        Seed of the random generator used to fill the universes when no seeds
+        are given. The same ``random_state`` always yields the same universes.
+
+    Attributes
+    ----------
+    cells: numpy.ndarray
+        ``uint8`` array of shape ``(count, height, width)`` holding all
+        universes.
+    rules: `list` [`Rule Func`]
+        Rule of every universe.
+    wrap: bool
+        Whether to wrap the universes around the edges.
+    generation: int
+        Amount of generations computed since the start of the simulation.
+
+    Raises
+    ------
+    ImportError
+        If NumPy is not installed.
+
+    Notes
+    -----
+    Like the ``numpy`` engine, batches only support totalistic rules.
+
+    Examples
+    --------
+    Population of 1000 random 32x32 soups, for each of 100 generations
+
+    >>> batch = Batch(32, 32, 1000, rules=["B3/S23", "B36/S23"] * 500)
+    >>> batch.run(100).shape
+    (100, 1000)
+
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, width: int, height: int, count: int = None,
+                 seeds: Any = None, rules: Union[Rule, str, Sequence] = conways_life,
+                 wrap: bool = True, random_state: int = None):
+        if np is None:
+            raise ImportError("Batches require NumPy to be installed")
+
+        if seeds is None:
+            rng = np.random.default_rng(random_state)
+            seeds = rng.integers(0, 2, (count or 1, height, width), dtype=np.uint8)
+
+        self.cells = np.array(seeds, dtype=np.uint8).reshape(-1, height, width)
+        self.width = width
+        self.height = height
+        self.wrap = wrap
+        self.generation = 0
+
+        if isinstance(rules, str) or callable(rules):
+            rules = [rules] * len(self.cells)
+        self.rules = [resolve(rule) for rule in rules]
+
+        if len(self.rules) != len(self.cells):
+            raise ValueError(f"Got {len(self.rules)} rules for "
+                             f"{len(self.cells)} universes")
+
+        # Rules the masks were built for, and the masks
+        self._masks = (list(self.rules), _rule_masks(self.rules))
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __getitem__(self, index: int) -> Game:
+        return self.game(index)
+
+    def game(self, index: int, **kwargs) -> Game:
+        """Copy a single universe into a ``Game``.
+
+        Parameters
+        ----------
+        index: int
+            Index of the universe.
+        **kwargs
+            Further keyword arguments passed to ``Game``, e.g. ``engine``.
+
+        Returns
+        -------
+        Game
+            Game starting from the current state of the universe.
+        """
+        return Game(self.width, self.height, self.cells[index].tolist(),
+                    wrap=self.wrap, rule=self.rules[index], **kwargs)
+
+    def tick(self) -> Batch:
+        """Advance all universes by one tick.
+
+        Returns
+        -------
+        self: Batch
+            Returns the batch object to allow chaining.
+        """
+        # Rules may have been changed since the masks were built
+        if self._masks[0] != self.rules:
+            self._masks = (list(self.rules), _rule_masks(self.rules))
+
+        padded = np.pad(self.cells, ((0, 0), (1, 1), (1, 1)),
+                        mode="wrap" if self.wrap else "constant")
+        index = self.cells * np.uint8(9) + neighbor_counts(padded)
+
+        masks = self._masks[1][:, np.newaxis, np.newaxis]
+        self.cells = (masks >> index & 1).astype(np.uint8)
+        self.generation += 1
+        return self
+
+    def populations(self) -> np.ndarray:
+        """Get the population of every universe.
+
+        Returns
+        -------
+        numpy.ndarray
+            Amount of living cells of every universe.
+        """
+        return self.cells.sum(axis=(1, 2), dtype=np.int64)
+
+    def hashes(self) -> np.ndarray:
+        """Get a 64-bit hash of every universe.
+
+        Equal universes always have equal hashes, so hashes can be used to
+        detect universes that stabilized or repeat themselves.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``uint64`` hash of every universe.
+        """
+        packed = np.packbits(self.cells.reshape(len(self.cells), -1), axis=1)
+        packed = np.pad(packed, ((0, 0), (0, -packed.shape[1] % 8)))
+        words = packed.view(np.uint64)
+
+        return (words * _weights(words.shape[1])).sum(axis=1, dtype=np.uint64)
+
+    def run(self, times: int, hashes: bool = False) -> np.ndarray:
+        """Run the simulation of all universes.
+
+        Parameters
+        ----------
+        times: int
+            Amount of ticks to run the simulation.
+        hashes: bool, optional
+            Whether to record the hash instead of the population of every
+            universe. Defaults to ``False``.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of shape ``(times, count)`` holding the population (or hash)
+            of every universe after every tick.
+        """
+        measure = self.hashes if hashes else self.populations
+        result = np.empty((times, len(self.cells)),
+                          dtype=np.uint64 if hashes else np.int64)
+
+        for i in range(times):
+            self.tick()
+            result[i] = measure()
+
+        return result
+
+
+def _rule_masks(rules: Sequence[Rule]) -> np.ndarray:
+    """Transition table of every rule as an 18-bit mask.
+
+    Bit ``9 * cell + live_count`` of a mask holds the next state of a cell.
+    """
+    return np.array([_rule_mask(rule) for rule in rules], dtype=np.uint32)
+
+
+@lru_cache(maxsize=None)
+def _rule_mask(rule: Rule) -> int:
+    """Transition table of a rule as an 18-bit mask."""
+    dead, alive = transition_table(rule)
+    return sum(state << bit for bit, state in enumerate(dead + alive))
+
+
+@lru_cache(maxsize=None)
+def _weights(length: int) -> np.ndarray:
+    """Random odd 64-bit multipliers, identical for every batch."""
+    weights = np.random.default_rng(0).integers(0, 2 ** 63, length, dtype=np.uint64)
+    return weights * np.uint64(2) + np.uint64(1)
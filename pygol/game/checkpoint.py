@@ -0,0 +1,124 @@
+"""PyGoL binary checkpoints"""
+from __future__ import annotations
+
+import json
+import os
+import struct
+import zlib
+from typing import Any, Dict, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+#: Magic bytes starting every checkpoint
+MAGIC = b"PYGOL\x00CK"
+#: Current version of the checkpoint format
+VERSION = 1
+#: Layout of the fixed size preamble: magic, version and header length
+PREAMBLE = struct.Struct("<8sHI")
+
+
+def write(path: str, cells: Any, header: Dict[str, Any],
+          level: int = 1) -> None:
+    """Write a checkpoint file.
+
+    A checkpoint consists of a fixed size preamble (``MAGIC``, format version
+    and header length), a JSON header and the compressed cells. The header
+    records the size of the grid and statistics about its cells, along with
+    any information passed in. Cells are split into bit planes, holding bit
+    ``i`` of every cell in plane ``i``, and every plane is packed into 8 cells
+    per byte. Two-state grids thus only have a single plane. The file is
+    replaced atomically, so an interrupted write never corrupts an existing
+    checkpoint.
+
+    Parameters
+    ----------
+    path: str
+        Path of the checkpoint file.
+    cells: `Any`
+        Grid of ``uint8`` cells, e.g. a list of lists or a NumPy array.
+    header: `dict` [str, `Any`]
+        JSON serializable information stored along with the cells.
+    level: int, optional
+        ``zlib`` compression level. Defaults to ``1``, the fastest level.
+
+    Raises
+    ------
+    ImportError
+        If NumPy is not installed.
+    """
+    if np is None:
+        raise ImportError("Checkpoints require NumPy to be installed")
+
+    if not hasattr(cells, "__array__"):
+        # Rows of small ints convert to bytes much faster than to an array
+        rows = [bytes(row) for row in cells]
+        cells = np.frombuffer(b"".join(rows), np.uint8).reshape(len(rows), -1)
+
+    cells = np.asarray(cells, dtype=np.uint8)
+    planes = max(int(cells.max(initial=0)).bit_length(), 1)
+    population = np.count_nonzero(cells if planes == 1 else cells == 1)
+    header = {**header, "height": cells.shape[0], "width": cells.shape[1],
+              "planes": planes, "stats": {"population": int(population)}}
+
+    compressor = zlib.compressobj(level)
+    with open(path + ".tmp", "wb") as file:
+        encoded = json.dumps(header).encode()
+        file.write(PREAMBLE.pack(MAGIC, VERSION, len(encoded)))
+        file.write(encoded)
+
+        for plane in range(planes):
+            bits = cells if planes == 1 else cells >> plane & 1
+            file.write(compressor.compress(np.packbits(bits, axis=None)))
+        file.write(compressor.flush())
+
+    os.replace(path + ".tmp", path)
+
+
+def read(path: str) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """Read a checkpoint file written by ``write``.
+
+    Parameters
+    ----------
+    path: str
+        Path of the checkpoint file.
+
+    Returns
+    -------
+    `tuple` [numpy.ndarray, `dict` [str, `Any`]]
+        ``uint8`` grid of shape ``(height, width)`` and the header of the
+        checkpoint.
+
+    Raises
+    ------
+    ImportError
+        If NumPy is not installed.
+    ValueError
+        If the file is not a checkpoint or was written by a newer version of
+        the checkpoint format.
+    """
+    if np is None:
+        raise ImportError("Checkpoints require NumPy to be installed")
+
+    with open(path, "rb") as file:
+        magic, version, length = PREAMBLE.unpack(file.read(PREAMBLE.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a PyGoL checkpoint")
+        if version > VERSION:
+            raise ValueError(f"{path} uses checkpoint format {version}, only "
+                             f"formats up to {VERSION} are supported")
+
+        header = json.loads(file.read(length))
+        data = zlib.decompress(file.read())
+
+    shape = header["height"], header["width"]
+    size = shape[0] * shape[1]
+    packed = np.frombuffer(data, dtype=np.uint8).reshape(header["planes"], -1)
+
+    cells = np.zeros(size, dtype=np.uint8)
+    for plane, bits in enumerate(packed):
+        cells |= np.unpackbits(bits, count=size) << plane
+
+    return cells.reshape(shape), header
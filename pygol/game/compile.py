@@ -0,0 +1,556 @@
+"""Compiled rules and rule strings"""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, FrozenSet, NamedTuple, Tuple, Union
+
+from pygol.utils.matrix import NEIGHBORS
+
+if TYPE_CHECKING:
+    from .rules import Neighbors, Signature
+
+#: RegEx matching ``Bxxx/Syyy`` rule strings
+BS_REG = re.compile(r"^B([0-8]*)/?S([0-8]*)$", re.IGNORECASE)
+#: RegEx matching ``yyy/xxx`` (survival/birth) rule strings
+SB_REG = re.compile(r"^([0-8]*)/([0-8]*)$")
+#: RegEx matching ``Bxxx/Syyy/Cz`` Generations rule strings
+BSC_REG = re.compile(r"^B([0-8]*)/S([0-8]*)/C?(\d+)$", re.IGNORECASE)
+#: RegEx matching ``yyy/xxx/z`` (survival/birth/states) Generations rule strings
+SBC_REG = re.compile(r"^([0-8]*)/([0-8]*)/(\d+)$")
+#: RegEx matching isotropic non-totalistic rule strings in Hensel notation
+HENSEL_REG = re.compile(r"^B((?:[0-8]-?[a-z]*)*)/?S((?:[0-8]-?[a-z]*)*)$",
+                        re.IGNORECASE)
+#: RegEx matching ``Rr,Cc,Mm,Sa..b,Ba..b,Nn`` Larger than Life rule strings
+LTL_REG = re.compile(r"^R(\d+),C(\d+),M([01]),S(\d+)\.\.(\d+),"
+                     r"B(\d+)\.\.(\d+)(?:,N([MN]))?$", re.IGNORECASE)
+
+#: Offsets of the neighbors of a cell, clockwise starting north
+RING = ((0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1))
+#: One neighborhood of every Hensel letter for 1 to 4 living neighbors, given
+#: as the states of the neighbors in ``RING`` order. The letters of 5 to 7
+#: living neighbors name the complements of the 3 to 1 neighbor letters.
+HENSEL = {
+    1: {"c": "00000001", "e": "10000000"},
+    2: {"c": "01000001", "e": "10000010", "k": "00100001", "a": "10000001",
+        "i": "10001000", "n": "00010001"},
+    3: {"c": "01000101", "e": "10100010", "k": "00101001", "a": "10000011",
+        "i": "11000001", "n": "01100001", "y": "01001001", "q": "10010001",
+        "j": "10100001", "r": "10001001"},
+    4: {"c": "01010101", "e": "10101010", "k": "01001011", "a": "11100001",
+        "i": "01100011", "n": "11000101", "y": "01100101", "q": "10010011",
+        "j": "10101001", "r": "10100011", "t": "11001001", "w": "10110001",
+        "z": "10011001"},
+}
+
+
+class TotalisticRule(NamedTuple):
+    """Compiled totalistic rule.
+
+    A totalistic rule only depends on the state of a cell and the amount of
+    living neighbors. It is fully described by the neighbor counts giving birth
+    to dead cells and the counts letting living cells survive. Engines apply
+    compiled rules in bulk using their transition table instead of calling a
+    function for every cell.
+
+    Compiled rules are callable like any other rule function.
+
+    Attributes
+    ----------
+    births: `frozenset` [int]
+        Neighbor counts giving birth to a dead cell.
+    survivals: `frozenset` [int]
+        Neighbor counts letting a living cell survive.
+
+    Examples
+    --------
+    >>> rule = compile_rule("B36/S23")
+    >>> rule
+    TotalisticRule(births=frozenset({3, 6}), survivals=frozenset({2, 3}))
+    >>> str(rule)
+    'B36/S23'
+    >>> rule(0, 6)
+    1
+
+    """
+    births: FrozenSet[int]
+    survivals: FrozenSet[int]
+
+    def __call__(self, cell: int, live_count: int,
+                 neighbors: Neighbors = None) -> int:
+        return self.table[cell][live_count]
+
+    def __str__(self) -> str:
+        births = "".join(map(str, sorted(self.births)))
+        survivals = "".join(map(str, sorted(self.survivals)))
+        return f"B{births}/S{survivals}"
+
+    @property
+    def table(self) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        """`tuple` [`tuple` [int, ...], `tuple` [int, ...]]: Transition table
+        of the rule, see ``transition_table``."""
+        return transition_table(self)
+
+    @property
+    def mask(self) -> int:
+        """int: Transition table as an 18-bit mask. Bit ``9 * cell + count``
+        holds the next state of a cell with ``count`` living neighbors."""
+        return (sum(1 << count for count in self.births) |
+                sum(1 << 9 + count for count in self.survivals))
+
+    @classmethod
+    def tabulate(cls, rule: Signature) -> TotalisticRule:
+        """Compile a totalistic rule function.
+
+        Parameters
+        ----------
+        rule: `callable` [[int, int, Neighbors], int]
+            Rule function to compile. The rule must not depend on the
+            individual neighbors of a cell.
+
+        Returns
+        -------
+        TotalisticRule
+            Compiled rule.
+        """
+        births, survivals = transition_table(rule)
+
+        return cls(frozenset(count for count in range(9) if births[count]),
+                   frozenset(count for count in range(9) if survivals[count]))
+
+
+class GenerationsRule(NamedTuple):
+    """Compiled multi-state rule of the Generations family.
+
+    Cells have ``states`` states: ``0`` is dead, ``1`` is alive and ``2`` to
+    ``states - 1`` are dying. Dead cells are born and living cells survive
+    like in a totalistic rule, but only fully alive cells count as living
+    neighbors. A living cell that does not survive starts dying instead of
+    dying right away, and dying cells advance to the next state every
+    generation until they are dead.
+
+    Compiled rules are callable like any other rule function.
+
+    Attributes
+    ----------
+    births: `frozenset` [int]
+        Neighbor counts giving birth to a dead cell.
+    survivals: `frozenset` [int]
+        Neighbor counts letting a living cell survive.
+    states: int
+        Amount of states, including the dead and the alive state.
+
+    Examples
+    --------
+    Brian's Brain
+
+    >>> rule = compile_rule("/2/3")
+    >>> str(rule)
+    'B2/S/C3'
+    >>> rule(1, 2), rule(2, 2)
+    (2, 0)
+
+    """
+    births: FrozenSet[int]
+    survivals: FrozenSet[int]
+    states: int
+
+    def __call__(self, cell: int, live_count: int,
+                 neighbors: Neighbors = None) -> int:
+        return self.table[cell][live_count]
+
+    def __str__(self) -> str:
+        births = "".join(map(str, sorted(self.births)))
+        survivals = "".join(map(str, sorted(self.survivals)))
+        return f"B{births}/S{survivals}/C{self.states}"
+
+    @property
+    def table(self) -> Tuple[Tuple[int, ...], ...]:
+        """`tuple` [`tuple` [int, ...], ...]: Table of the next state of a
+        cell, indexed by the current state of the cell (``0`` to
+        ``states - 1``) and the count of its fully alive neighbors (``0`` to
+        ``8``)."""
+        return _generations_table(self)
+
+
+@lru_cache(maxsize=None)
+def _generations_table(rule: GenerationsRule) -> Tuple[Tuple[int, ...], ...]:
+    """Tabulate a Generations rule, see ``GenerationsRule.table``."""
+    dead, alive = transition_table(TotalisticRule(rule.births, rule.survivals))
+    decay = tuple((cell + 1) % rule.states for cell in range(1, rule.states))
+
+    return (dead, tuple(1 if survive else decay[0] for survive in alive),
+            *((state,) * 9 for state in decay[1:]))
+
+
+class IsotropicRule(NamedTuple):
+    """Compiled isotropic non-totalistic rule.
+
+    Isotropic rules depend on the arrangement of the living neighbors of a
+    cell, up to rotations and reflections. Every arrangement is named by its
+    neighbor count and a letter in Hensel notation (e.g. ``2a`` for two
+    adjacent neighbors, see ``HENSEL``). Engines look the next state of a cell
+    up in a 512 entry table indexed by its 3x3 neighborhood.
+
+    Compiled rules are callable like any other rule function, as long as the
+    neighbors are passed in.
+
+    Attributes
+    ----------
+    births: `frozenset` [str]
+        Neighborhoods giving birth to a dead cell.
+    survivals: `frozenset` [str]
+        Neighborhoods letting a living cell survive.
+
+    Examples
+    --------
+    >>> rule = compile_rule("B2-a/S12")
+    >>> str(rule)
+    'B2-a/S12'
+    >>> "2a" in rule.births, "2c" in rule.births
+    (False, True)
+
+    """
+    births: FrozenSet[str]
+    survivals: FrozenSet[str]
+
+    def __call__(self, cell: int, live_count: int,
+                 neighbors: Neighbors = None) -> int:
+        # Neighbors are yielded in the order of ``matrix.NEIGHBORS``
+        index = cell << 4
+        for (dir_x, dir_y), (value, *_) in zip(NEIGHBORS, neighbors):
+            index |= value << 3 * (dir_y + 1) + dir_x + 1
+
+        return self.table[index]
+
+    def __str__(self) -> str:
+        return f"B{_hensel_string(self.births)}/S{_hensel_string(self.survivals)}"
+
+    @property
+    def table(self) -> Tuple[int, ...]:
+        """`tuple` [int, ...]: Next state of a cell, indexed by its 3x3
+        neighborhood. Bit ``3 * (dy + 1) + dx + 1`` of the index holds the
+        cell at offset ``(dx, dy)``, so bit ``4`` holds the cell itself."""
+        return _isotropic_table(self)
+
+
+@lru_cache(maxsize=None)
+def hensel_names() -> Tuple[str, ...]:
+    """Name every arrangement of living neighbors in Hensel notation.
+
+    Returns
+    -------
+    `tuple` [str, ...]
+        Name of every arrangement, indexed by the states of the neighbors in
+        ``RING`` order as bits of the index, starting with the northern
+        neighbor at bit ``0``.
+    """
+    def symmetries(ring: int):
+        bits = [ring >> i & 1 for i in range(8)]
+        for turn in range(0, 8, 2):
+            for flip in (1, -1):
+                yield sum(bits[(flip * i + turn) % 8] << i for i in range(8))
+
+    names = [""] * 256
+    names[0], names[255] = "0", "8"
+    for count, letters in HENSEL.items():
+        for letter, neighbors in letters.items():
+            ring = int(neighbors[::-1], 2)
+            for other in symmetries(ring):
+                names[other] = f"{count}{letter}"
+                if count < 4:
+                    names[~other & 255] = f"{8 - count}{letter}"
+
+    return tuple(names)
+
+
+def hensel_letters(count: int) -> str:
+    """Get the Hensel letters of an amount of living neighbors.
+
+    Parameters
+    ----------
+    count: int
+        Amount of living neighbors (``0`` to ``8``).
+
+    Returns
+    -------
+    str
+        Letters naming the arrangements of ``count`` neighbors. Empty for
+        ``0`` and ``8`` neighbors, which only have one arrangement.
+    """
+    return "".join(HENSEL.get(min(count, 8 - count), ()))
+
+
+@lru_cache(maxsize=None)
+def _isotropic_table(rule: IsotropicRule) -> Tuple[int, ...]:
+    """Tabulate an isotropic rule, see ``IsotropicRule.table``."""
+    names = hensel_names()
+    table = []
+
+    for index in range(512):
+        ring = sum((index >> 3 * (dir_y + 1) + dir_x + 1 & 1) << i
+                   for i, (dir_x, dir_y) in enumerate(RING))
+        counts = rule.survivals if index >> 4 & 1 else rule.births
+        table.append(int(names[ring] in counts))
+
+    return tuple(table)
+
+
+def _hensel_neighborhoods(segment: str) -> FrozenSet[str]:
+    """Get the neighborhoods of the births or survivals of a Hensel string."""
+    neighborhoods = set()
+
+    for count, minus, letters in re.findall(r"([0-8])(-?)([a-z]*)",
+                                            segment.lower()):
+        count, valid = int(count), hensel_letters(int(count))
+        if set(letters) - set(valid):
+            raise ValueError(f"Invalid neighborhoods for {count} neighbors: "
+                             f"{letters!r}")
+
+        if not valid:
+            neighborhoods.add(str(count))
+        elif minus or not letters:
+            letters = "".join(letter for letter in valid if letter not in letters)
+
+        neighborhoods.update(f"{count}{letter}" for letter in letters)
+
+    return frozenset(neighborhoods)
+
+
+def _hensel_string(neighborhoods: FrozenSet[str]) -> str:
+    """Write neighborhoods in Hensel notation, as short as possible."""
+    result = ""
+
+    for count in range(9):
+        valid = hensel_letters(count)
+        letters = "".join(letter for letter in valid
+                          if f"{count}{letter}" in neighborhoods)
+        missing = "".join(letter for letter in valid if letter not in letters)
+
+        if not valid and str(count) in neighborhoods or valid and not missing:
+            result += str(count)
+        elif letters:
+            result += (f"{count}-{missing}" if len(missing) < len(letters)
+                       else f"{count}{letters}")
+
+    return result
+
+
+class LargerThanLifeRule(NamedTuple):
+    """Compiled Larger than Life rule.
+
+    Larger than Life rules are totalistic rules counting the living cells in a
+    neighborhood of any radius. Like Generations rules, they can have more
+    than two states, with dying cells not being counted as living neighbors.
+
+    Compiled rules are callable like any other rule function, as long as the
+    living cells in the neighborhood of the rule are counted.
+
+    Attributes
+    ----------
+    radius: int
+        Range of the neighborhood.
+    births: range
+        Neighbor counts giving birth to a dead cell.
+    survivals: range
+        Neighbor counts letting a living cell survive.
+    states: int
+        Amount of states, including the dead and the alive state. Defaults to
+        ``2``.
+    middle: bool
+        Whether a living cell counts itself as a neighbor. Defaults to
+        ``True``.
+    neighborhood: `union` [str, `frozenset` [`tuple` [int, int]]]
+        ``M`` for the Moore neighborhood (a square), ``N`` for the von Neumann
+        neighborhood (a diamond), or the offsets ``(dx, dy)`` of a custom
+        neighborhood. Defaults to ``M``.
+
+    Examples
+    --------
+    Bosco's Rule
+
+    >>> rule = compile_rule("R5,C0,M1,S34..58,B34..45,NM")
+    >>> len(rule.offsets)
+    121
+    >>> rule(0, 40), rule(1, 60)
+    (1, 0)
+
+    """
+    radius: int
+    births: range
+    survivals: range
+    states: int = 2
+    middle: bool = True
+    neighborhood: Union[str, FrozenSet[Tuple[int, int]]] = "M"
+
+    def __call__(self, cell: int, live_count: int,
+                 neighbors: Neighbors = None) -> int:
+        if cell == 1:
+            return 1 if live_count in self.survivals else 2 % self.states
+        if cell:
+            return (cell + 1) % self.states
+
+        return int(live_count in self.births)
+
+    def __str__(self) -> str:
+        if not isinstance(self.neighborhood, str):
+            return repr(self)
+
+        return (f"R{self.radius},C{self.states if self.states > 2 else 0},"
+                f"M{self.middle:d},S{self.survivals.start}..{self.survivals.stop - 1},"
+                f"B{self.births.start}..{self.births.stop - 1},N{self.neighborhood}")
+
+    @property
+    def offsets(self) -> Tuple[Tuple[int, int], ...]:
+        """`tuple` [`tuple` [int, int], ...]: Offsets ``(dx, dy)`` of all cells
+        counted as neighbors, including ``(0, 0)`` if ``middle`` is set."""
+        return _ltl_offsets(self)
+
+    @property
+    def table(self) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        """`tuple` [`tuple` [int, ...], `tuple` [int, ...]]: Whether a dead
+        cell is born and a living cell survives, indexed by the count of its
+        living neighbors (``0`` to ``len(offsets)``)."""
+        return tuple(
+            tuple(int(live_count in counts)
+                  for live_count in range(len(self.offsets) + 1))
+            for counts in (self.births, self.survivals)
+        )
+
+
+@lru_cache(maxsize=None)
+def _ltl_offsets(rule: LargerThanLifeRule) -> Tuple[Tuple[int, int], ...]:
+    """Get the neighborhood of a rule, see ``LargerThanLifeRule.offsets``."""
+    radius, kind = rule.radius, rule.neighborhood
+    square = range(-radius, radius + 1)
+
+    if kind == "M":
+        offsets = {(dir_x, dir_y) for dir_y in square for dir_x in square}
+    elif kind == "N":
+        offsets = {(dir_x, dir_y) for dir_y in square for dir_x in square
+                   if abs(dir_x) + abs(dir_y) <= radius}
+    else:
+        offsets = set(kind)
+
+    offsets.discard((0, 0))
+    if rule.middle:
+        offsets.add((0, 0))
+
+    return tuple(sorted(offsets, key=lambda offset: offset[::-1]))
+
+
+def compile_rule(rule: str) -> Union[TotalisticRule, GenerationsRule,
+                                     IsotropicRule, LargerThanLifeRule]:
+    """Compile a rule string.
+
+    Parameters
+    ----------
+    rule: str
+        Rule string in ``B/S`` notation (e.g. ``B3/S23``) or ``S/B`` notation
+        (e.g. ``23/3``). Generations rules append the amount of states, in
+        ``B/S/C`` notation (e.g. ``B2/S/C3``) or ``S/B/C`` notation (e.g.
+        ``/2/3``). Isotropic non-totalistic rules use ``B/S`` notation with
+        Hensel letters (e.g. ``B2-a/S12``). Larger than Life rules use
+        ``Rr,Cc,Mm,Sa..b,Ba..b,Nn`` notation (e.g.
+        ``R5,C0,M1,S34..58,B34..45,NM``).
+
+    Returns
+    -------
+    `union` [TotalisticRule, GenerationsRule, IsotropicRule, LargerThanLifeRule]
+        Compiled rule. Generations rules with only two states are plain
+        totalistic rules.
+
+    Raises
+    ------
+    ValueError
+        If the rule string is not a valid rule string.
+
+    Examples
+    --------
+    >>> compile_rule("B3/S23") == compile_rule("23/3")
+    True
+    >>> compile_rule("345/2/4")
+    GenerationsRule(births=frozenset({2}), survivals=frozenset({3, 4, 5}), states=4)
+
+    """
+    rule = rule.strip()
+
+    match = LTL_REG.match(rule)
+    if match:
+        radius, states, middle, *counts, kind = match.groups()
+        survive_min, survive_max, birth_min, birth_max = map(int, counts)
+
+        return LargerThanLifeRule(int(radius), range(birth_min, birth_max + 1),
+                                  range(survive_min, survive_max + 1),
+                                  max(int(states), 2), middle == "1",
+                                  (kind or "M").upper())
+
+    match = BS_REG.match(rule) or BSC_REG.match(rule)
+    if match:
+        births, survivals, *states = match.groups()
+    else:
+        match = SB_REG.match(rule) or SBC_REG.match(rule)
+        if not match:
+            match = HENSEL_REG.match(rule)
+            if not match:
+                raise ValueError(f"Invalid rule string: {rule!r}")
+
+            return IsotropicRule(*map(_hensel_neighborhoods, match.groups()))
+
+        survivals, births, *states = match.groups()
+
+    states = int(states[0]) if states else 2
+    if states < 2:
+        raise ValueError(f"Rules need at least 2 states: {rule!r}")
+
+    births, survivals = frozenset(map(int, births)), frozenset(map(int, survivals))
+    if states == 2:
+        return TotalisticRule(births, survivals)
+
+    return GenerationsRule(births, survivals, states)
+
+
+@lru_cache(maxsize=None)
+def transition_table(rule: Signature) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """Tabulate a totalistic rule function.
+
+    Parameters
+    ----------
+    rule: `callable` [[int, int, Neighbors], int]
+        Rule function to tabulate. The rule must not depend on the individual
+        neighbors of a cell, i.e. it must ignore its ``neighbors`` argument.
+
+    Returns
+    -------
+    `tuple` [`tuple` [int, ...], `tuple` [int, ...]]
+        Table of the next state of a cell, indexed by the current state of the
+        cell (``0`` or ``1``) and the count of its living neighbors (``0`` to
+        ``8``).
+
+    Raises
+    ------
+    ValueError
+        If the rule is a multi-state ``GenerationsRule``, an
+        ``IsotropicRule`` or a ``LargerThanLifeRule``. Use their ``table``
+        instead.
+
+    Examples
+    --------
+    >>> transition_table(compile_rule("B3/S23"))
+    ((0, 0, 0, 1, 0, 0, 0, 0, 0), (0, 0, 1, 1, 0, 0, 0, 0, 0))
+
+    """
+    if isinstance(rule, (GenerationsRule, IsotropicRule, LargerThanLifeRule)):
+        raise ValueError(f"{rule} is not a two-state totalistic rule, engines "
+                         "using totalistic transition tables do not support it")
+
+    if isinstance(rule, TotalisticRule):
+        return tuple(
+            tuple(int(live_count in counts) for live_count in range(9))
+            for counts in (rule.births, rule.survivals)
+        )
+
+    return tuple(
+        tuple(rule(cell, live_count, None) for live_count in range(9))
+        for cell in (0, 1)
+    )
@@ -1,14 +1,50 @@
 """PyGoL Game of Life"""
 from __future__ import annotations
 
+import contextlib
+import csv
+import functools
+import itertools
 import multiprocessing as mp
+import struct
+import time
 from signal import SIGTERM
-from typing import Any, Callable, List, Union
+from typing import (Any, BinaryIO, Callable, Dict, Iterator, List, NamedTuple,
+                    Optional, Union)
 
-from pygol.utils import Matrix
+from pygol.utils import Matrix, TextRenderer
 
+from .checkpoint import read as read_checkpoint
+from .checkpoint import write as write_checkpoint
+from .compile import LargerThanLifeRule
+from .engines import ENGINES, Engine, Stats
+from .engines.base import Window
 from .rules import Signature as Rule
-from .rules import conways_life, RULES
+from .rules import conways_life, resolve, rule_string
+from .stream import Generation
+
+
+#: Columns of the statistics recorded by ``Game.run``
+STATS_HEADER = ("generation", "population", "births", "deaths", "x", "y",
+                "width", "height")
+
+#: Binary format of a row of statistics recorded by ``Game.run``
+STATS_RECORD = struct.Struct(f"<{len(STATS_HEADER)}q")
+
+
+class Cycle(NamedTuple):
+    """Periodic behaviour of a game.
+
+    Attributes
+    ----------
+    start: int
+        Generation the cycle was first seen at.
+    period: int
+        Amount of generations after which the game repeats itself. Still lifes
+        have a period of ``1``.
+    """
+    start: int
+    period: int
 
 
 class Game(Matrix):
@@ -21,23 +57,39 @@ class Game(Matrix):
 
     seed: `list` [`list` [`Any`]], optional
         Seed or base grid to start the simulation with. Must only contain ``0``
-        for dead cells and ``1`` for alive cells. When parsing an RLE file this
-        seed is returned from ``utils.parse_rle.parse()`` as part of the user
-        environment. If not specified, it defaults to a randomly filled matrix.
+        for dead cells and ``1`` for alive cells, as well as ``2`` and higher
+        for dying cells when using a Generations rule. When parsing an RLE
+        file this seed is returned from ``utils.parse_rle.parse()`` as part of
+        the user environment. If not specified, it defaults to a randomly
+        filled matrix.
 
     wrap: bool, optional
         Whether to wrap the matrix around the edges. Defaults to ``True``.
 
     rule: `union` [`Rule Func`, str], optional
         Rule string or function to be used to run the simulation. Check the
-        `game.rules` module to see available rules and rule strings. If not
-        specified the rule defaults to the standard ``Conway's Game of Life``
-        rule.
+        `game.rules` module to see available rules and rule strings. Any other
+        ``B/S`` or ``S/B`` rule string, as well as multi-state Generations rule
+        strings (e.g. ``/2/3``), is compiled using ``compile.compile_rule``. If
+        not specified the rule defaults to the standard ``Conway's Game of
+        Life`` rule.
 
     alive, dead: str, optional
         Strings used to represent dead and alive cells. If not specified, alive
         cells are represented using ``•`` and dead cells using `` ``.
 
+    engine: `union` [Engine, str], optional
+        Engine or engine name used to compute generations. Check the
+        `game.engines` module to see available engines. If not specified the
+        engine defaults to the pure Python ``python`` engine, which supports
+        every rule function. The ``numpy`` engine is much faster on large grids
+        but only supports totalistic rules.
+
+    random_state: int, optional
+        Seed of the random generator used to fill the grid when no ``seed`` is
+        given, see ``Matrix.fill_random``. If not specified, every game starts
+        from a different random grid.
+
 
     Attributes
     ----------
@@ -52,6 +104,31 @@ class Game(Matrix):
         game and display it.
     charmap: `dict` [`str`, `str`]
         Dict containing strings to display dead and alive cells
+    engine: Engine
+        Engine used to compute generations
+    generation: int
+        Amount of generations computed since the start of the simulation
+    history: `dict` [int, int]
+        Fingerprints of recently recorded game states, mapped to the generation
+        they were recorded at. See ``detect()``.
+    max_history: int
+        Maximum amount of game states kept in ``history``. Defaults to
+        ``1000``.
+    cycle: `optional` [Cycle]
+        Periodic behaviour of the game, once detected by ``detect()``.
+    stats: Stats
+        Population, births, deaths and bounding box of the current
+        generation. See ``Engine.stats``.
+    margin: `optional` [int]
+        Amount of empty cells kept around the pattern when the grid is grown
+        and cropped automatically, or ``None`` if it is not. See
+        ``autosize()``.
+    crop_every: int
+        Amount of generations between attempts to crop the grid. Defaults to
+        ``64``.
+    offset: `tuple` [int, int]
+        Position of the top left corner of the grid relative to the original
+        grid, changed as the grid is grown and cropped.
 
     Examples
     --------
@@ -75,64 +152,396 @@ class Game(Matrix):
 
     """
 
+    # Games hold the settings of the simulation and display, as well as the
+    # state of statistics, autosizing and cycle detection
+    # pylint: disable=too-many-instance-attributes
+
     # pylint: disable=too-many-arguments
     def __init__(self, width: int, height: int, seed: List[List[Any]] = None,
                  wrap: bool = True, rule: Union[Rule, str] = conways_life,
-                 alive: str = "•", dead: str = " ") -> Game:
-        if not seed:
-            seed = Matrix(width, height).fill_random()
+                 alive: str = "•", dead: str = " ",
+                 engine: Union[Engine, str] = "python",
+                 random_state: int = None) -> Game:
+        if seed is None or not len(seed):
+            seed = Matrix(width, height).fill_random(
+                random_state=random_state).matrix
+
+        rule = resolve(rule)
 
-        if isinstance(rule, str):
-            try:
-                rule = RULES[rule]
-            except KeyError:
-                rule = RULES[rule.upper()]
+        if isinstance(engine, str):
+            engine = ENGINES[engine]()
 
         super().__init__(width, height, seed)
         self.wrap = wrap
         self.rule = rule
+        self.engine = engine
+        self.generation = 0
+        self.history: Dict[int, int] = {}
+        self.max_history = 1000
+        self.cycle: Optional[Cycle] = None
         self.out = lambda x: None
         self.charmap = {
             "alive": alive,
             "dead": dead
         }
+        self.margin: Optional[int] = None
+        self.crop_every = 64
+        self.offset = (0, 0)
+        # Grid of the previous generation and the grid it was advanced to
+        self._previous = (None, None)
+        self._stats = (None, None)
+        self._cropped = 0
+        # Grid checked by autosizing and the amount of generations it still
+        # fits without another check
+        self._fitted = (None, 0)
+        # Generation, period and snapshot of a suspected cycle
+        self._candidate = None
+
+    def __getstate__(self):
+        # The previous generation stays with the simulation process
+        state = {**self.__dict__, "_previous": (None, None),
+                 "_stats": (None, None), "_fitted": (None, 0),
+                 "_candidate": None}
+        return state, {slot: getattr(self, slot) for slot in Matrix.__slots__}
+
+    def _renderer(self, cells: bytes) -> TextRenderer:
+        return _renderer(self.charmap["alive"], self.charmap["dead"])
+
+    def tolist(self) -> List[List[int]]:
+        return self.engine.dump(self)
+
+    @property
+    def stats(self) -> Stats:
+        """Stats: Statistics of the current generation.
+
+        Taken from the statistics the engine collected while computing the
+        current grid (see ``Engine.tally``). Engines not collecting them
+        compute the statistics from the current grid and the grid of the
+        previous generation on first access, and cache them until the game
+        advances. Births and deaths are then only known if the game advanced
+        by a single generation since the grid was last replaced.
+        """
+        grid, stats = self._stats
+        if grid is not self.matrix or stats.generation != self.generation:
+            tally = self.engine.tally
+            if tally is not None and tally.grid is self.matrix:
+                stats = Stats(self.generation, *tally[1:])
+            else:
+                previous, current = self._previous
+                if current is not self.matrix:
+                    previous = None
 
-    def __str__(self) -> str:
-        res = ""
-
-        for row in self:
-            for col in row:
-                res += self.charmap["alive"] if col == 1 else self.charmap["dead"]
-            res += "\n"
+                stats = self.engine.stats(self, previous)
+            self._stats = (self.matrix, stats)
 
-        return res
+        return stats
 
     def tick(self) -> Game:
         """Advance the simulation by one tick.
 
         Construct a new game state by applying the rule function to all cells.
+        The computation is delegated to the engine of the game.
+
+        Returns
+        -------
+        self: Game
+            Returns the game object to allow chaining.
+        """
+        if self._autosized:
+            return self.skip(1)
+
+        previous = self.matrix
+        self.matrix = self.engine.tick(self)
+        self._previous = (previous, self.matrix)
+        self.generation += 1
+        return self
+
+    def skip(self, generations: int) -> Game:
+        """Advance the simulation by several ticks at once.
+
+        Engines able to skip generations (e.g. the ``hashlife`` engine) compute
+        the resulting game state without computing the generations in between.
+
+        Parameters
+        ----------
+        generations: int
+            Amount of ticks to advance the simulation.
+
+        Returns
+        -------
+        self: Game
+            Returns the game object to allow chaining.
+
+        Examples
+        --------
+        >>> from pygol.utils import parse_rle
+        >>> conw = Game(**parse_rle("examples/rle/gosper.rle"), engine="hashlife")
+        >>> print(conw.skip(10**9).generation)
+        1000000000
+
+        """
+        if not self._autosized:
+            return self._advance(generations)
+
+        # Patterns spread by at most ``halo`` cells per generation, so the
+        # grid is only checked once every ``chunk`` generations
+        halo = self._halo()
+        chunk = max(self.margin // halo, 1)
+
+        while generations > 0:
+            grid, fits = self._fitted
+            if grid is not self.matrix or not fits:
+                self._fit(chunk * halo)
+                fits = chunk
+
+            count = min(fits, generations)
+            self._advance(count)
+            self._fitted = (self.matrix, fits - count)
+            generations -= count
+
+        return self
+
+    def autosize(self, margin: Optional[int] = 8,
+                 crop_every: int = 64) -> Game:
+        """Grow and crop the grid to follow the pattern.
+
+        Without wrapping, cells beyond the edges of the grid are dead, so
+        patterns reaching an edge are clipped. Once enabled, the bounding box
+        of the living cells (see ``stats``) is checked once every ``margin``
+        generations, or less for rules spreading patterns by several cells per
+        generation. Whenever the pattern could reach an edge before the next
+        check, that side of the grid is grown by at least half of the
+        size of the grid, so that growing a grid costs amortized constant time
+        per cell. Every ``crop_every`` generations, sides with empty margins
+        larger than half of the grid are cropped back down to ``margin``
+        cells. ``offset`` tracks the position of the grid.
+
+        Parameters
+        ----------
+        margin: `optional` [int], optional
+            Minimum amount of empty cells added around the pattern when a side
+            of the grid is grown or cropped. Defaults to ``8``. ``None``
+            disables growing and cropping.
+        crop_every: int, optional
+            Amount of generations between attempts to crop the grid. Defaults
+            to ``64``.
 
         Returns
         -------
         self: Game
             Returns the game object to allow chaining.
+
+        Notes
+        -----
+        Grids are only grown and cropped if ``wrap`` is ``False`` and the
+        engine simulates a bounded universe. Engines simulating an unbounded
+        universe (e.g. the ``sparse`` engine) never clip patterns. Births and
+        deaths (see ``stats``) are not known for generations following a crop.
+
+        Examples
+        --------
+        Follow a glider without ever clipping it
+
+        >>> conw = Game(3, 3, [[0, 1, 0], [0, 0, 1], [1, 1, 1]], wrap=False)
+        >>> conw.autosize(margin=2).skip(400).stats.population
+        5
+
         """
-        grid = Matrix(self.width, self.height)
-        nb = self.neighbors
+        self.margin = margin
+        self.crop_every = crop_every
+        return self
+
+    @property
+    def _autosized(self) -> bool:
+        """Whether the grid has to be grown and cropped."""
+        return (self.margin is not None and not self.wrap
+                and not isinstance(self.matrix, Window))
+
+    def _halo(self) -> int:
+        """Maximum distance a pattern spreads in a single generation."""
         rule = self.rule
+        return rule.radius if isinstance(rule, LargerThanLifeRule) else 1
+
+    def _advance(self, generations: int) -> Game:
+        """Advance the simulation without growing or cropping the grid."""
+        previous = self.matrix
+        self.matrix = self.engine.advance(self, generations)
+        self._previous = (previous if generations == 1 else None, self.matrix)
+        self.generation += generations
+        return self
 
-        for y in range(self.height):
-            for x in range(self.width):
-                cell = self[y][x]
+    def _fit(self, needed: int) -> None:
+        """Keep the pattern ``needed`` cells away from the edges of the grid."""
+        bounds = self.stats.bounds
+        if bounds is None:
+            return
+
+        x, y, width, height = bounds
+        # Empty margins on the top, right, bottom and left of the pattern
+        borders = (y, self.width - x - width, self.height - y - height, x)
+        sizes = (self.height, self.width, self.height, self.width)
+
+        crop = self.generation - self._cropped >= self.crop_every
+        if crop:
+            self._cropped = self.generation
+
+        pads = []
+        for border, size in zip(borders, sizes):
+            if border < needed:
+                pads.append(max(self.margin, needed, size // 2) - border)
+            elif crop and border > max(2 * self.margin, size // 2):
+                pads.append(max(self.margin, needed) - border)
+            else:
+                pads.append(0)
+
+        if any(pads):
+            top, right, bottom, left = pads
+            self.pad(top, right, bottom, left)
+            self.offset = (self.offset[0] - left, self.offset[1] - top)
+
+    def generations(self, times: int = None,
+                    step: int = 1) -> Iterator[Generation]:
+        """Lazily advance the simulation.
+
+        Every generation is computed only once the previous one has been
+        consumed, and is yielded as a lightweight view of the game instead of
+        a copy of its grid. Views can be combined with the operators of the
+        ``stream`` module, e.g. ``stream.until_stable``.
 
-                neighbors = nb(x, y, wrap=self.wrap)
-                alive_count = sum([x for x, *_ in neighbors])
+        Parameters
+        ----------
+        times: int, optional
+            Amount of generations to yield. If not specified, the simulation
+            is advanced indefinitely.
+        step: int, optional
+            Amount of ticks between yielded generations, computed using
+            ``skip()``. Defaults to ``1``.
+
+        Returns
+        -------
+        `iterator` [Generation]
+            View of the game after every ``step`` ticks. A view is only valid
+            until the next generation is requested.
 
-                grid[y][x] = rule(cell, alive_count, neighbors)
+        Examples
+        --------
+        Population of a random soup until it stabilizes
 
-        self.matrix = grid
+        >>> from pygol.game.stream import until_stable
+        >>> conw = Game(100, 100, engine="numpy")
+        >>> populations = [view.population
+        ...                for view in until_stable(conw.generations())]
+
+        """
+        count = itertools.count() if times is None else range(times)
+
+        for _ in count:
+            self.skip(step)
+            yield Generation(self)
+
+    def view(self, x: int, y: int) -> Game:
+        """Move the window of the game onto an unbounded universe.
+
+        Only engines simulating an unbounded universe (e.g. the ``sparse`` and
+        ``hashlife`` engines) support moving the window. The window keeps its
+        width and height.
+
+        Parameters
+        ----------
+        x, y: int
+            Coordinates of the top left corner of the window in the universe.
+            The window of a new game starts at ``(0, 0)``.
+
+        Returns
+        -------
+        self: Game
+            Returns the game object to allow chaining.
+
+        Examples
+        --------
+        Follow a glider moving south-east
+
+        >>> conw = Game(3, 3, [[0, 1, 0], [0, 0, 1], [1, 1, 1]], engine="sparse")
+        >>> for i in range(1, 5):
+        ...     conw.skip(4).view(i, i)
+
+        """
+        self.matrix = self.engine.move(self, (x, y))
+        return self
+
+    def save(self, path: str) -> Game:
+        """Save a checkpoint of the game.
+
+        The grid is stored bit-packed and compressed along with the
+        generation, rule and edge handling of the game, and its population.
+        See ``checkpoint.write`` for the file format.
+
+        Parameters
+        ----------
+        path: str
+            Path of the checkpoint file. An existing file is replaced.
+
+        Returns
+        -------
+        self: Game
+            Returns the game object to allow chaining.
+
+        Notes
+        -----
+        Rule functions that cannot be described by a rule string are not
+        stored, and must be passed to ``load()`` instead. Engines simulating
+        an unbounded universe only store the cells of the window.
+
+        Examples
+        --------
+        >>> conw = Game(10_000, 10_000, engine="numpy").skip(100)
+        >>> conw.save("soup.pygol")
+        >>> Game.load("soup.pygol", engine="numpy").generation
+        100
+
+        """
+        write_checkpoint(path, self.matrix, {
+            "generation": self.generation,
+            "rule": rule_string(self.rule),
+            "wrap": self.wrap
+        })
         return self
 
+    @classmethod
+    def load(cls, path: str, **kwargs) -> Game:
+        """Load a checkpoint saved using ``save()``.
+
+        Parameters
+        ----------
+        path: str
+            Path of the checkpoint file.
+        **kwargs
+            Further keyword arguments passed to ``Game``, e.g. ``engine``.
+            The stored rule and edge handling can be overridden using ``rule``
+            and ``wrap``.
+
+        Returns
+        -------
+        Game
+            Game continuing the simulation at the stored generation.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a checkpoint, or if no rule is given and none
+            is stored in the checkpoint.
+        """
+        cells, header = read_checkpoint(path)
+        kwargs = {"rule": header["rule"], "wrap": header["wrap"], **kwargs}
+
+        if kwargs["rule"] is None:
+            raise ValueError(f"The rule of {path} is not stored, pass it to "
+                             "load()")
+
+        game = cls(header["width"], header["height"], cells, **kwargs)
+        game.generation = header["generation"]
+        return game
+
     def pipe(self, func: Callable[[mp.Pipe], None]) -> Game:
         """Save a display function.
 
@@ -160,7 +569,75 @@ class Game(Matrix):
         self.out = func
         return self
 
-    def run(self, times: int, delay: float = 0.1) -> Game:
+    def detect(self) -> Optional[Cycle]:
+        """Record the current game state and detect periodic behaviour.
+
+        The fingerprint of the current state is compared to the states in
+        ``history``. As different states may share a fingerprint, a state
+        whose fingerprint was already recorded ``period`` generations earlier
+        is only suspected to be periodic. The cycle is detected once the state
+        ``period`` generations later is exactly equal (see
+        ``Engine.snapshot``), and the game is periodic from the suspected
+        state on.
+
+        Returns
+        -------
+        `optional` [Cycle]
+            Detected cycle, or ``None`` if the game did not repeat itself yet.
+            The cycle is also saved in ``cycle``.
+
+        Notes
+        -----
+        Only cycles shorter than ``max_history`` generations are detected. If
+        the start of the cycle has already been dropped from ``history``, the
+        reported start is a later generation of the cycle. Cycles are detected
+        one period after the state first repeated itself, and only if
+        ``detect()`` is called for that generation.
+
+        Examples
+        --------
+        >>> conw = Game(5, 5, [[0, 0, 0, 0, 0],
+        ...                    [0, 0, 1, 0, 0],
+        ...                    [0, 0, 1, 0, 0],
+        ...                    [0, 0, 1, 0, 0],
+        ...                    [0, 0, 0, 0, 0]])
+        >>> conw.detect()
+        >>> conw.tick().detect()
+        >>> conw.tick().detect()
+        >>> conw.tick().detect()
+        >>> conw.tick().detect()
+        Cycle(start=2, period=2)
+
+        """
+        if self._candidate is not None:
+            start, period, snapshot = self._candidate
+            if self.generation >= start + period:
+                self._candidate = None
+
+            if self.generation == start + period and \
+                    self.engine.snapshot(self) == snapshot:
+                self.cycle = Cycle(start, period)
+                return self.cycle
+
+        key = self.engine.fingerprint(self)
+        start = self.history.get(key)
+
+        if start is not None and start < self.generation and \
+                self._candidate is None:
+            self._candidate = (self.generation, self.generation - start,
+                               self.engine.snapshot(self))
+
+        self.history[key] = self.generation
+        if len(self.history) > self.max_history:
+            del self.history[next(iter(self.history))]
+
+        return None
+
+    # pylint: disable=too-many-arguments
+    def run(self, times: int, delay: float = 0.1, detect: bool = False,
+            stop: bool = False, checkpoint: str = None,
+            checkpoint_every: int = 0, stride: int = None,
+            fps: float = None, record: str = None) -> Game:
         """Run the life simulation and call the display function
 
         Parameters
@@ -169,12 +646,45 @@ class Game(Matrix):
             Amount of ticks to run the simulation.
         delay: float, optional
             Delay between every frame of the simulation. Defaults to ``0.1``
-            seconds.
+            seconds. Replaced by ``1 / fps`` if ``fps`` is given.
+        detect: bool, optional
+            Whether to detect periodic behaviour (see ``detect()``). Once the
+            game is periodic, the simulation jumps straight to its final state
+            after ``times`` ticks, which is the last frame displayed. Defaults
+            to ``False``.
+        stop: bool, optional
+            Whether to stop the simulation as soon as periodic behaviour is
+            detected, instead of jumping to the final state. Implies
+            ``detect``. Defaults to ``False``.
+        checkpoint: str, optional
+            Path to save checkpoints of the game to (see ``save()``). The game
+            is saved at the end of the run, as well as every
+            ``checkpoint_every`` generations.
+        checkpoint_every: int, optional
+            Amount of generations between checkpoints. Defaults to ``0``,
+            only saving the game at the end of the run.
+        stride: int, optional
+            Only display every ``stride``-th generation. The generations in
+            between are computed without being sent to the display.
+        fps: float, optional
+            Target frame rate of the display. The simulation computes as many
+            generations as it can between frames, and only displays a
+            generation once ``1 / fps`` seconds passed since the last frame.
+        record: str, optional
+            Path of a CSV file to write the statistics (see ``stats``) of
+            every computed generation to. Rows are written as the simulation
+            runs, so memory use does not grow with the amount of generations.
+            Paths ending in ``.bin`` are written as a binary time series
+            instead: one ``STATS_RECORD`` row of little-endian 64-bit integers
+            per generation, in the order of ``STATS_HEADER`` and with ``-1``
+            for missing values. These files can be loaded with
+            ``numpy.fromfile(record, "<i8").reshape(-1, len(STATS_HEADER))``.
 
         Returns
         -------
         self: Game
-            Returns the game object to allow chaining.
+            Returns the game object to allow chaining. If periodic behaviour
+            was detected, it is available in ``cycle``.
 
         Notes
         -----
@@ -182,25 +692,102 @@ class Game(Matrix):
         simulation and writing the game states to the pipe. The run function
         may terminate before having completed the specified number of ticks
         if it receives a ``SIGTERM`` signal from the display function.
+
+        By default every generation is displayed, so the speed of the
+        simulation is limited by the display. With ``stride`` and ``fps``, a
+        generation is displayed as soon as either of them is due. The last
+        generation is always displayed.
         """
         read, write = mp.Pipe(duplex=True)
 
         display = mp.Process(target=self.out, args=(read,))
         display.start()
 
-        write.send(delay)
+        with contextlib.ExitStack() as stack:
+            # Stop the display, even if the simulation fails
+            stack.callback(display.join)
+            stack.callback(read.close)
+            stack.callback(write.send, SIGTERM)
+
+            interval = 1 / fps if fps else None
+            write.send(delay if interval is None else interval)
+
+            detect = detect or stop
+            if detect:
+                self.detect()
+
+            shown = time.monotonic()
+
+            write_row = None
+            if record and record.endswith(".bin"):
+                write_row = functools.partial(
+                    _write_record, stack.enter_context(open(record, "wb")))
+            elif record:
+                write_row = csv.writer(stack.enter_context(
+                    open(record, "w", newline="", encoding="utf-8"))).writerow
+                write_row(STATS_HEADER)
+
+            for i in range(times):
+                self.tick()
+                if write_row:
+                    write_row(_stats_row(self.stats))
+
+                if detect and self.detect():
+                    if not stop:
+                        # Skip whole periods, the state after them is known
+                        remaining = times - i - 1
+                        self.skip(remaining % self.cycle.period)
+                        self.generation += remaining - remaining % self.cycle.period
+
+                        if write_row and remaining:
+                            write_row(_stats_row(self.stats))
+
+                    write.send(self)
+                    break
+
+                now = time.monotonic()
+                if _frame_due(i + 1, times, stride, interval, now - shown):
+                    write.send(self)
+                    shown = now
 
-        for _ in range(times):
-            self.tick()
-            write.send(self)
+                if checkpoint and checkpoint_every and \
+                        self.generation % checkpoint_every == 0:
+                    self.save(checkpoint)
 
-            # Check if display process ended (e.g. user closed window)
-            if write.poll():
-                display_ended = write.recv()
-                if display_ended == SIGTERM:
-                    break
+                # Check if display process ended (e.g. user closed window)
+                if write.poll():
+                    display_ended = write.recv()
+                    if display_ended == SIGTERM:
+                        break
+
+            if checkpoint:
+                self.save(checkpoint)
 
-        write.send(SIGTERM)
-        read.close()
-        display.join()
         return self
+
+
+@functools.lru_cache(maxsize=8)
+def _renderer(alive: str, dead: str) -> TextRenderer:
+    """Get the renderer of a charmap, shared to cache rows across frames."""
+    return TextRenderer([dead, alive])
+
+
+def _frame_due(count: int, times: int, stride: Optional[int],
+               interval: Optional[float], elapsed: float) -> bool:
+    """Whether ``Game.run`` displays the ``count``-th computed generation."""
+    if stride is None and interval is None or count == times:
+        return True
+
+    return bool(stride and count % stride == 0
+                or interval and elapsed >= interval)
+
+
+def _stats_row(stats: Stats) -> List[Any]:
+    """Flatten statistics into a row of ``STATS_HEADER`` columns."""
+    bounds = stats.bounds or (None,) * 4
+    return [*stats[:-1], *bounds]
+
+
+def _write_record(file: BinaryIO, row: List[Any]) -> None:
+    """Write a row of ``STATS_HEADER`` columns as a ``STATS_RECORD``."""
+    file.write(STATS_RECORD.pack(*(-1 if value is None else value for value in row)))
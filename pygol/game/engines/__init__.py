@@ -0,0 +1,22 @@
+"""PyGoL simulation engines"""
+from .active import ActiveEngine
+from .base import Engine, Stats
+from .bitpacked import BitEngine
+from .hashlife import HashLifeEngine
+from .mapped import MappedEngine
+from .parallel import ParallelEngine
+from .pure import PythonEngine
+from .sparse import SparseEngine
+from .vectorized import NumpyEngine
+
+#: Dict collection of all available simulation engines by name
+ENGINES = {
+    "python": PythonEngine,
+    "numpy": NumpyEngine,
+    "bitpacked": BitEngine,
+    "hashlife": HashLifeEngine,
+    "active": ActiveEngine,
+    "sparse": SparseEngine,
+    "parallel": ParallelEngine,
+    "mapped": MappedEngine
+}
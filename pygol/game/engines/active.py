@@ -0,0 +1,217 @@
+"""Active-region simulation engine"""
+from __future__ import annotations
+
+import functools
+import math
+from typing import TYPE_CHECKING, List, Set, Tuple
+
+from pygol.utils.matrix import ALIVE
+
+from ..compile import (GenerationsRule, IsotropicRule, LargerThanLifeRule,
+                       TotalisticRule)
+from .base import Engine, RowCensus
+
+if TYPE_CHECKING:
+    from pygol.game import Game
+
+Tile = Tuple[int, int]
+
+
+class ActiveEngine(Engine):
+    """Active-region simulation engine.
+
+    The grid is split into square tiles. A tile is active if one of its cells
+    or a cell of one of its neighboring tiles changed during the previous tick.
+    Only the cells of active tiles are computed, all other tiles are carried
+    over unchanged. The cost of a tick therefore scales with the activity of
+    the pattern instead of the area of the grid.
+
+    Like the ``python`` engine, the engine keeps two grids and alternates
+    between them. The grid receiving the next generation still holds the
+    previous generation, which only differs from the current generation in
+    tiles changed during the last tick. These tiles are active, so only the
+    active tiles are written, and the rest of the grid is never copied.
+    Likewise, the statistics of the next generation (see ``Engine.tally``) are
+    only updated for the rows of active tiles.
+
+    Parameters
+    ----------
+    tile_size: int, optional
+        Width and height of a tile in cells. Defaults to ``8``.
+
+    Attributes
+    ----------
+    tile_size: int
+        Width and height of a tile in cells.
+    changed: `set` [`tuple` [int, int]]
+        Column and row of all tiles changed during the last tick.
+    active_tiles: int
+        Amount of tiles computed during the last tick.
+    total_tiles: int
+        Total amount of tiles in the grid.
+
+    Notes
+    -----
+    The grid returned by a tick is reused two ticks later. Copy it to keep a
+    generation around.
+
+    Like the pure Python engine, this engine supports every rule function and
+    isotropic rule, but not multi-state Generations rules or Larger than Life
+    rules. Rule functions receive an empty ``neighbors`` iterator. The first
+    tick, as well as every tick following a change of the size, rule or edge
+    handling of the game, computes all tiles. Cells modified directly (e.g.
+    ``game[y][x] = 1``) are not tracked; call ``reset()`` afterwards.
+    """
+
+    # Public tile statistics on top of the state carried between ticks
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, tile_size: int = 8):
+        self.tile_size = tile_size
+        self.changed: Set[Tile] = set()
+        self.active_tiles = 0
+        self.total_tiles = 0
+        self._state = None
+        self._buffers = [None, None]
+        # Grid read and grid written by the last tick
+        self._last = (None, None)
+        # Statistics of the rows of the grid written by the last tick
+        self._census = None
+
+    def __getstate__(self):
+        # Buffers stay with the simulation process
+        return {**super().__getstate__(), "_buffers": [None, None],
+                "_last": (None, None), "_census": None}
+
+    def reset(self) -> None:
+        """Forget the tracked changes, computing all tiles on the next tick."""
+        self._last = (None, None)
+
+    def load(self, game: Game) -> List[List[int]]:
+        if isinstance(game.matrix, list):
+            return game.matrix
+
+        return self.dump(game)
+
+    def tick(self, game: Game) -> List[List[int]]:
+        # Cells are computed inline, as calling helpers for every cell is slow
+        # pylint: disable=too-many-locals
+        cells = self.load(game)
+        width, height, wrap, rule = game.width, game.height, game.wrap, game.rule
+        size = self.tile_size
+        isotropic = isinstance(rule, IsotropicRule)
+        table = rule.table if isinstance(rule, (TotalisticRule, IsotropicRule)) \
+            else None
+
+        if isinstance(rule, (GenerationsRule, LargerThanLifeRule)):
+            raise ValueError("The active engine does not support Generations "
+                             "or Larger than Life rules")
+
+        columns = math.ceil(width / size)
+        rows = math.ceil(height / size)
+        self.total_tiles = columns * rows
+
+        if self._state != (width, height, wrap, rule):
+            self._buffers = [None, None]
+            self._last = (None, None)
+
+        grid = self._target(cells)
+        if cells is not self._last[1]:
+            active = {(tx, ty) for ty in range(rows) for tx in range(columns)}
+            self._census = RowCensus(height)
+        else:
+            active = self._neighborhood(self.changed, columns, rows, wrap)
+
+        near_x, offsets_x = _near(width, wrap)
+        near_y, offsets_y = _near(height, wrap)
+        changed = set()
+
+        for tx, ty in active:
+            for y in range(ty * size, min((ty + 1) * size, height)):
+                near_rows = [cells[near] for near in near_y[y]]
+                row, out = cells[y], grid[y]
+
+                for x in range(tx * size, min((tx + 1) * size, width)):
+                    cell = row[x]
+
+                    if isotropic:
+                        # Bit ``3 * dy + dx`` holds the cell at offset
+                        # ``(dx - 1, dy - 1)``, see ``IsotropicRule.table``
+                        new = table[sum(
+                            near[col] << 3 * dy + dx
+                            for near, dy in zip(near_rows, offsets_y[y])
+                            for col, dx in zip(near_x[x], offsets_x[x]))]
+                    else:
+                        alive_count = sum(near[col] for near in near_rows
+                                          for col in near_x[x]) - cell
+                        new = table[cell][alive_count] if table else \
+                            rule(cell, alive_count, ())
+                    out[x] = new
+                    if new != cell:
+                        changed.add((tx, ty))
+
+        for y in {y for _, ty in active
+                  for y in range(ty * size, min((ty + 1) * size, height))}:
+            self._census.update(y, bytes(cells[y]).translate(ALIVE),
+                                bytes(grid[y]).translate(ALIVE))
+
+        self.tally = self._census.tally(grid)
+        self.changed = changed
+        self.active_tiles = len(active)
+        self._last = cells, grid
+        self._state = width, height, wrap, rule
+        return grid
+
+    def _target(self, cells: List[List[int]]) -> List[List[int]]:
+        """Get the buffer to write the next generation into.
+
+        The buffer holds the previous generation if the last tick read from
+        it. Otherwise, the current generation is copied into it first.
+        """
+        buffers = self._buffers
+        index = 1 if cells is buffers[0] else 0
+        target = buffers[index]
+
+        if target is None:
+            target = buffers[index] = [row[:] for row in cells]
+        elif target is not self._last[0] or cells is not self._last[1]:
+            for row, source in zip(target, cells):
+                row[:] = source
+
+        return target
+
+    @staticmethod
+    def _neighborhood(tiles: Set[Tile], columns: int, rows: int,
+                      wrap: bool) -> Set[Tile]:
+        result = set()
+
+        for tx, ty in tiles:
+            for dy in (-1, 0, 1):
+                for dx in (-1, 0, 1):
+                    x, y = tx + dx, ty + dy
+
+                    if wrap:
+                        result.add((x % columns, y % rows))
+                    elif 0 <= x < columns and 0 <= y < rows:
+                        result.add((x, y))
+
+        return result
+
+
+@functools.lru_cache(maxsize=8)
+def _near(length: int,
+          wrap: bool) -> Tuple[List[List[int]], List[List[int]]]:
+    """Indices of every index and its neighbors along one axis.
+
+    Returns
+    -------
+    `tuple` [`list` [`list` [int]], `list` [`list` [int]]]
+        Indices of the neighbors of every index, including the index itself,
+        and their offsets plus one, i.e. ``0`` for the preceding, ``1`` for the
+        same and ``2`` for the following index.
+    """
+    deltas = [[d for d in (-1, 0, 1) if wrap or 0 <= i + d < length]
+              for i in range(length)]
+
+    return ([[(i + d) % length for d in near] for i, near in enumerate(deltas)],
+            [[d + 1 for d in near] for near in deltas])
@@ -0,0 +1,423 @@
+"""Simulation engine base class"""
+from __future__ import annotations
+
+from typing import (TYPE_CHECKING, Any, Hashable, Iterator, List, NamedTuple,
+                    Optional, Tuple)
+
+from pygol.utils.matrix import ALIVE
+
+if TYPE_CHECKING:
+    from pygol.game import Game
+
+
+class Stats(NamedTuple):
+    """Statistics of a generation.
+
+    Attributes
+    ----------
+    generation: int
+        Generation the statistics describe.
+    population: int
+        Amount of living cells.
+    births, deaths: `optional` [int]
+        Amount of cells that came to life and that died since the previous
+        generation. ``None`` if the previous generation is not known, e.g.
+        for the seed of a game or after skipping several generations.
+    bounds: `optional` [`tuple` [int, int, int, int]]
+        ``(x, y, width, height)`` of the smallest rectangle containing all
+        living cells, or ``None`` if there are no living cells.
+    """
+    generation: int
+    population: int
+    births: Optional[int]
+    deaths: Optional[int]
+    bounds: Optional[Tuple[int, int, int, int]]
+
+
+class Tally(NamedTuple):
+    """Statistics of a generation, collected by an engine while computing it.
+
+    Attributes
+    ----------
+    grid: `Any`
+        Grid returned by the tick the statistics were collected in.
+    population, births, deaths, bounds
+        See ``Stats``. Births and deaths are counted against the grid the tick
+        read.
+    """
+    grid: Any
+    population: int
+    births: int
+    deaths: int
+    bounds: Optional[Tuple[int, int, int, int]]
+
+
+class RowCensus:
+    """Statistics of a grid, updated one row at a time.
+
+    Engines computing a generation row by row pass every written row to the
+    census, and get a ``Tally`` once the generation is complete. Rows that are
+    not passed keep their counts from the previous generation, so engines only
+    writing some rows of a grid pay for these rows only.
+
+    Parameters
+    ----------
+    height: int
+        Amount of rows of the grid.
+    """
+
+    def __init__(self, height: int):
+        self.counts = [0] * height
+        self.spans: List[Optional[Tuple[int, int]]] = [None] * height
+        self.births = self.deaths = 0
+
+    def update(self, y: int, before: bytes, after: bytes) -> None:
+        """Record the new state of a row.
+
+        Parameters
+        ----------
+        y: int
+            Index of the row.
+        before, after: bytes
+            Row in the previous and in the new generation, with ``1``
+            representing a living cell and ``0`` representing any other cell.
+        """
+        if after != before:
+            # Cells are bytes of 0 or 1, so the sum never carries
+            total = int.from_bytes(after, "big") + 2 * int.from_bytes(before, "big")
+            changes = total.to_bytes(len(after), "big")
+            self.births += changes.count(1)
+            self.deaths += changes.count(2)
+
+        count = after.count(1)
+        self.counts[y] = count
+        self.spans[y] = (after.find(1), after.rfind(1)) if count else None
+
+    def tally(self, grid: Any) -> Tally:
+        """Finish the statistics of a generation.
+
+        Births and deaths are reset, so the census can be reused for the next
+        generation.
+
+        Parameters
+        ----------
+        grid: `Any`
+            Grid of the generation.
+
+        Returns
+        -------
+        Tally
+            Statistics of the generation.
+        """
+        occupied = [y for y, span in enumerate(self.spans) if span]
+        bounds = None
+        if occupied:
+            left = min(self.spans[y][0] for y in occupied)
+            right = max(self.spans[y][1] for y in occupied)
+            bounds = (left, occupied[0], right - left + 1,
+                      occupied[-1] - occupied[0] + 1)
+
+        tally = Tally(grid, sum(self.counts), self.births, self.deaths, bounds)
+        self.births = self.deaths = 0
+        return tally
+
+
+class Window:
+    """Window onto an unbounded universe.
+
+    Engines simulating an unbounded universe store it in a subclass of this
+    class. The window supports ``grid[row][col]`` access and iteration over its
+    rows just like a list of lists. The rows of the window are only computed
+    when they are first accessed and are read-only: changes to them are not
+    written back to the universe.
+
+    Parameters
+    ----------
+    origin: `tuple` [int, int]
+        Coordinates of the top left corner of the window in the universe.
+    width, height: int
+        Width and height of the window.
+    """
+
+    def __init__(self, origin: Tuple[int, int], width: int, height: int):
+        self.origin = origin
+        self.width = width
+        self.height = height
+        self._rows = None
+
+    @property
+    def rows(self) -> List[List[int]]:
+        """`list` [`list` [int]]: Cells of the window."""
+        if self._rows is None:
+            self._rows = [[0] * self.width for _ in range(self.height)]
+            self.paint(self._rows)
+
+        return self._rows
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __iter__(self) -> Iterator[List[int]]:
+        yield from self.rows
+
+    def __getitem__(self, row: int) -> List[int]:
+        return self.rows[row]
+
+    def paint(self, rows: List[List[int]]) -> None:
+        """Write the living cells inside of the window into a grid.
+
+        Parameters
+        ----------
+        rows: `list` [`list` [int]]
+            Empty grid of the size of the window.
+        """
+        raise NotImplementedError
+
+    def moved(self, origin: Tuple[int, int]) -> Window:
+        """Get a window onto the same universe at another position.
+
+        Parameters
+        ----------
+        origin: `tuple` [int, int]
+            Coordinates of the top left corner of the new window.
+
+        Returns
+        -------
+        Window
+            Moved copy of the window.
+        """
+        # Not using copy.copy, as windows may only pickle their rows
+        window = object.__new__(type(self))
+        window.__dict__.update(self.__dict__, origin=origin, _rows=None)
+        return window
+
+
+class Engine:
+    """Base class of all simulation engines.
+
+    An engine computes the next generation of a ``Game``. Every engine is free
+    to keep the life grid in its own storage format (e.g. a list of lists or a
+    NumPy array), as long as the storage supports ``grid[row][col]`` access and
+    iteration over its rows. ``Game`` stores whatever the engine returns in
+    ``Game.matrix``.
+
+    Engines read the rule and edge handling from the game on every tick, so
+    changing ``Game.rule`` or ``Game.wrap`` between ticks is supported.
+
+    Engines visiting every cell during a tick collect the statistics of the
+    new generation on the way and store them in ``tally``, which ``Game.stats``
+    returns without another pass over the grid.
+    """
+
+    #: Statistics of the grid returned by the last tick, if collected
+    tally: Optional[Tally] = None
+
+    def __getstate__(self):
+        # The tally holds a grid, which is sent along with the game already
+        return {**self.__dict__, "tally": None}
+
+    def load(self, game: Game) -> Any:
+        """Convert the grid of a game into the storage format of the engine.
+
+        Parameters
+        ----------
+        game: Game
+            Game whose grid should be converted.
+
+        Returns
+        -------
+        `Any`
+            Grid in the storage format of the engine. Grids already stored in
+            this format are returned as is.
+        """
+        return game.matrix
+
+    def dump(self, game: Game) -> List[List[int]]:
+        """Convert the grid of a game into a list of lists.
+
+        Parameters
+        ----------
+        game: Game
+            Game whose grid should be converted.
+
+        Returns
+        -------
+        `list` [`list` [int]]
+            Grid with ``0`` representing a dead cell and ``1`` representing a
+            living cell.
+        """
+        if hasattr(game.matrix, "tolist"):
+            return game.matrix.tolist()
+
+        return [[int(col) for col in row] for row in game.matrix]
+
+    def fingerprint(self, game: Game) -> int:
+        """Hash the grid of a game.
+
+        Parameters
+        ----------
+        game: Game
+            Game whose grid should be hashed.
+
+        Returns
+        -------
+        int
+            Hash of the grid. Equal grids always have equal hashes. Engines
+            simulating an unbounded universe hash the whole universe, so
+            patterns leaving the window are not mistaken for cycles.
+        """
+        return hash(self.snapshot(game))
+
+    def snapshot(self, game: Game) -> Hashable:
+        """Copy the grid of a game to compare it to later generations.
+
+        Unlike fingerprints, snapshots of different grids never compare equal.
+
+        Parameters
+        ----------
+        game: Game
+            Game whose grid should be copied.
+
+        Returns
+        -------
+        `Hashable`
+            Immutable copy of the grid. Engines simulating an unbounded
+            universe copy the whole universe. Engines storing grids larger than
+            memory return a cryptographic digest of the grid instead.
+        """
+        return tuple(bytes(row) for row in self.load(game))
+
+    def population(self, game: Game) -> int:
+        """Count the living cells of a game.
+
+        Parameters
+        ----------
+        game: Game
+            Game whose living cells should be counted.
+
+        Returns
+        -------
+        int
+            Amount of cells in state ``1``. Engines simulating an unbounded
+            universe count the living cells of the whole universe.
+        """
+        return sum(list(row).count(1) for row in self.load(game))
+
+    def stats(self, game: Game, previous: Any = None) -> Stats:
+        """Compute statistics of the current generation of a game.
+
+        Used for grids the engine did not compute itself, such as the seed of
+        a game, and by engines not collecting a ``tally`` during their ticks.
+        The default implementation stores
+        whether a cell is alive in one byte per cell and adds the current
+        generation to twice the previous one as big integers, so that births
+        and deaths can be counted as the bytes equal to ``1`` and ``2``.
+
+        Parameters
+        ----------
+        game: Game
+            Game whose current generation should be described.
+        previous: `Any`, optional
+            Grid of the previous generation, in the storage format of the
+            engine or as a list of lists. If not specified, births and deaths
+            are not computed.
+
+        Returns
+        -------
+        Stats
+            Statistics of the current generation. Engines simulating an
+            unbounded universe may only describe the cells of the window.
+        """
+        rows = [bytes(list(row)).translate(ALIVE) for row in self.load(game)]
+        cells = b"".join(rows)
+        births = deaths = None
+
+        if previous is not None:
+            before = b"".join(bytes(list(row)).translate(ALIVE)
+                              for row in previous)
+            # Cells are bytes of 0 or 1, so the sum never carries
+            total = int.from_bytes(cells, "big") + 2 * int.from_bytes(before, "big")
+            changes = total.to_bytes(len(cells), "big")
+            births, deaths = changes.count(1), changes.count(2)
+
+        occupied = [y for y, row in enumerate(rows) if 1 in row]
+        bounds = None
+        if occupied:
+            left = min(rows[y].find(1) for y in occupied)
+            right = max(rows[y].rfind(1) for y in occupied)
+            bounds = (left, occupied[0], right - left + 1,
+                      occupied[-1] - occupied[0] + 1)
+
+        return Stats(game.generation, cells.count(1), births, deaths, bounds)
+
+    def tick(self, game: Game) -> Any:
+        """Compute the next generation of a game.
+
+        Parameters
+        ----------
+        game: Game
+            Game to advance.
+
+        Returns
+        -------
+        `Any`
+            Next generation in the storage format of the engine. The current
+            grid of the game must not be modified.
+        """
+        raise NotImplementedError
+
+    def advance(self, game: Game, generations: int) -> Any:
+        """Compute the generation of a game several ticks ahead.
+
+        Engines able to skip generations override this method. The default
+        implementation ticks the game repeatedly.
+
+        Parameters
+        ----------
+        game: Game
+            Game to advance.
+        generations: int
+            Amount of generations to advance.
+
+        Returns
+        -------
+        `Any`
+            Generation ``generations`` ticks ahead in the storage format of the
+            engine. The current grid of the game must not be modified.
+        """
+        grid = game.matrix
+
+        try:
+            for _ in range(generations):
+                game.matrix = self.tick(game)
+            return game.matrix
+        finally:
+            game.matrix = grid
+
+    def move(self, game: Game, origin: Tuple[int, int]) -> Window:
+        """Move the window of a game onto an unbounded universe.
+
+        Parameters
+        ----------
+        game: Game
+            Game whose window should be moved.
+        origin: `tuple` [int, int]
+            Coordinates of the top left corner of the window in the universe.
+
+        Returns
+        -------
+        Window
+            Moved window.
+
+        Raises
+        ------
+        ValueError
+            If the engine simulates a bounded universe.
+        """
+        grid = self.load(game)
+
+        if not isinstance(grid, Window):
+            raise ValueError(
+                f"{type(self).__name__} does not simulate an unbounded universe")
+
+        return grid.moved(origin)
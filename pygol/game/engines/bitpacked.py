@@ -0,0 +1,402 @@
+"""Bit-packed simulation engine"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Iterator, List, Optional, Tuple
+
+from ..compile import transition_table
+from .base import Engine, Stats, Tally
+from .vectorized import bounding_box
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+if TYPE_CHECKING:
+    from pygol.game import Game
+
+#: Amount of cells packed into a single word
+WORD_SIZE = 64
+
+
+class BitRow:
+    """View on a single row of a ``BitGrid``.
+
+    Supports ``row[col]`` access, assignment and iteration, yielding ``0`` for
+    dead and ``1`` for living cells.
+
+    Parameters
+    ----------
+    words: numpy.ndarray
+        ``uint64`` words of the row.
+    width: int
+        Amount of cells in the row.
+    """
+
+    def __init__(self, words: np.ndarray, width: int):
+        self.words = words
+        self.width = width
+
+    def __len__(self) -> int:
+        return self.width
+
+    def __iter__(self) -> Iterator[int]:
+        yield from unpack(self.words[np.newaxis], self.width)[0].tolist()
+
+    def __getitem__(self, col: int) -> int:
+        word, bit = divmod(range(self.width)[col], WORD_SIZE)
+        return int(self.words[word] >> np.uint64(bit)) & 1
+
+    def __setitem__(self, col: int, value: int):
+        word, bit = divmod(range(self.width)[col], WORD_SIZE)
+        if value:
+            self.words[word] |= np.uint64(1 << bit)
+        else:
+            self.words[word] &= ~np.uint64(1 << bit)
+
+
+class BitGrid:
+    """Life grid storing every row as ``uint64`` words, one bit per cell.
+
+    Bit ``b`` of word ``w`` holds the cell in column ``64 * w + b``. Unused
+    bits of the last word of a row are always ``0``. The grid supports
+    ``grid[row][col]`` access and iteration over its rows just like a list of
+    lists.
+
+    Parameters
+    ----------
+    words: numpy.ndarray
+        ``uint64`` array of shape ``(height, ceil(width / 64))``.
+    width: int
+        Width of the grid in cells.
+    """
+
+    def __init__(self, words: np.ndarray, width: int):
+        self.words = words
+        self.width = width
+
+    @classmethod
+    def pack(cls, cells) -> BitGrid:
+        """Pack a grid of ``0`` and ``1`` cells.
+
+        Parameters
+        ----------
+        cells: `Any`
+            Grid to pack. Can be a list of lists or a NumPy array.
+
+        Returns
+        -------
+        BitGrid
+            Packed grid.
+        """
+        cells = np.asarray(cells, dtype=np.uint8)
+        height, width = cells.shape
+        padding = -width % WORD_SIZE
+
+        cells = np.pad(cells, ((0, 0), (0, padding)))
+        packed = np.packbits(cells, axis=1, bitorder="little")
+        words = packed.view("<u8").astype(np.uint64).reshape(height, -1)
+
+        return cls(words, width)
+
+    def __array__(self, dtype=None) -> np.ndarray:
+        cells = unpack(self.words, self.width)
+        return cells if dtype is None else cells.astype(dtype)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __iter__(self) -> Iterator[BitRow]:
+        for words in self.words:
+            yield BitRow(words, self.width)
+
+    def __getitem__(self, row: int) -> BitRow:
+        return BitRow(self.words[row], self.width)
+
+    def fill_run(self, row: int, start: int, stop: int, state: int) -> None:
+        """Set a run of cells of a row, see ``Grid.fill_run``.
+
+        Whole words inside the run are set using slice assignment. Cells with
+        a state other than ``0`` are alive.
+        """
+        if stop <= start:
+            return
+
+        words = self.words[row]
+        first, last = start // WORD_SIZE, (stop - 1) // WORD_SIZE
+        ones = ~np.uint64(0)
+        head = ones << np.uint64(start % WORD_SIZE)
+        tail = ones >> np.uint64(WORD_SIZE - 1 - (stop - 1) % WORD_SIZE)
+
+        if first == last:
+            head &= tail
+        else:
+            words[first + 1:last] = ones if state else 0
+            words[last] = words[last] | tail if state else words[last] & ~tail
+
+        words[first] = words[first] | head if state else words[first] & ~head
+
+
+def unpack(words: np.ndarray, width: int) -> np.ndarray:
+    """Unpack ``uint64`` words into a ``uint8`` grid of ``0`` and ``1`` cells.
+
+    Parameters
+    ----------
+    words: numpy.ndarray
+        ``uint64`` array of shape ``(height, ceil(width / 64))``.
+    width: int
+        Width of the grid in cells.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``uint8`` array of shape ``(height, width)``.
+    """
+    packed = words.astype("<u8").view(np.uint8)
+    return np.unpackbits(packed, axis=1, bitorder="little")[:, :width]
+
+
+class BitEngine(Engine):
+    """Bit-packed simulation engine.
+
+    Rows of the grid are packed into ``uint64`` words (see ``BitGrid``), so
+    every bitwise operation processes 64 cells at once. The eight neighbors of
+    all cells are obtained by shifting whole rows, and summed into a 4-bit
+    count with full-adder logic. The next generation is then selected from the
+    birth and survival counts of the rule. The statistics of the next
+    generation (see ``Engine.tally``) are counted on the words as well.
+
+    Notes
+    -----
+    This engine only supports totalistic rules, i.e. rules that solely depend
+    on the state of a cell and the amount of living neighbors. All rules in
+    ``game.rules.RULES`` are totalistic.
+
+    Raises
+    ------
+    ImportError
+        If NumPy is not installed.
+    """
+
+    def __init__(self):
+        if np is None:
+            raise ImportError("The bitpacked engine requires NumPy to be installed")
+
+    def load(self, game: Game) -> BitGrid:
+        if isinstance(game.matrix, BitGrid):
+            return game.matrix
+
+        return BitGrid.pack(np.array(game.matrix, dtype=np.uint8).reshape(
+            game.height, game.width))
+
+    def dump(self, game: Game) -> List[List[int]]:
+        return np.asarray(self.load(game)).tolist()
+
+    def fingerprint(self, game: Game) -> int:
+        return hash(self.load(game).words.tobytes())
+
+    def snapshot(self, game: Game) -> Tuple[int, Tuple[int, ...], bytes]:
+        grid = self.load(game)
+        return grid.width, grid.words.shape, grid.words.tobytes()
+
+    def population(self, game: Game) -> int:
+        return _count_bits(self.load(game).words)
+
+    def stats(self, game: Game, previous: Any = None) -> Stats:
+        grid = self.load(game)
+        words = grid.words
+        births = deaths = None
+
+        if previous is not None:
+            if not isinstance(previous, BitGrid):
+                previous = BitGrid.pack(previous)
+            births = _count_bits(words & ~previous.words)
+            deaths = _count_bits(previous.words & ~words)
+
+        return Stats(game.generation, _count_bits(words), births, deaths,
+                     _bounds(grid))
+
+    def tick(self, game: Game) -> BitGrid:
+        grid = self.load(game)
+        words, width = grid.words, grid.width
+
+        result = apply_rule(neighbor_counts(words, width, game.wrap), words,
+                            transition_table(game.rule))
+        result[:, -1] &= last_word_mask(width)
+        output = BitGrid(result, width)
+
+        # Births and deaths follow from the changed cells and the populations
+        population = _count_bits(result)
+        changes = _count_bits(result ^ words)
+        tally = self.tally
+        before = tally.population if tally and tally.grid is grid else \
+            _count_bits(words)
+        births = (changes + population - before) // 2
+
+        self.tally = Tally(output, population, births, changes - births,
+                           _bounds(output))
+        return output
+
+
+def neighbor_counts(words: np.ndarray, width: int, wrap: bool
+                    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Count the living neighbors of every cell of a bit-packed grid.
+
+    Parameters
+    ----------
+    words: numpy.ndarray
+        ``uint64`` words of the grid, see ``BitGrid``.
+    width: int
+        Width of the grid in cells.
+    wrap: bool
+        Whether to wrap the grid around the edges.
+
+    Returns
+    -------
+    `tuple` [numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]
+        Bit planes holding bit 0, 1, 2 and 3 of the neighbor count of every
+        cell.
+    """
+    west = shift_west(words, width, wrap)
+    east = shift_east(words, width, wrap)
+
+    ones, twos_a = full_adder(shift_north(west, wrap),
+                              shift_north(words, wrap),
+                              shift_north(east, wrap))
+    sum_b, twos_b = full_adder(shift_south(west, wrap),
+                               shift_south(words, wrap),
+                               shift_south(east, wrap))
+    sum_c, twos_c = west ^ east, west & east
+    ones, twos_d = full_adder(ones, sum_b, sum_c)
+    sum_e, fours_a = full_adder(twos_a, twos_b, twos_c)
+    fours_b = sum_e & twos_d
+
+    return ones, sum_e ^ twos_d, fours_a ^ fours_b, fours_a & fours_b
+
+
+def apply_rule(bits: Tuple[np.ndarray, ...], words: np.ndarray,
+               table: Tuple[Tuple[int, ...], Tuple[int, ...]]) -> np.ndarray:
+    """Select the next generation of a bit-packed grid.
+
+    Parameters
+    ----------
+    bits: `tuple` [numpy.ndarray, ...]
+        Bit planes of the neighbor counts, see ``neighbor_counts``.
+    words: numpy.ndarray
+        ``uint64`` words of the current generation.
+    table: `tuple` [`tuple` [int, ...], `tuple` [int, ...]]
+        Birth and survival table of the rule, see
+        ``compile.transition_table``.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``uint64`` words of the next generation. Bits beyond the width of the
+        grid are not cleared.
+    """
+    births, survivals = table
+    result = np.zeros_like(words)
+
+    for count in range(9):
+        if not births[count] and not survivals[count]:
+            continue
+
+        match = ~np.zeros_like(words)
+        for i, bit in enumerate(bits):
+            match &= bit if count >> i & 1 else ~bit
+
+        if not births[count]:
+            match &= words
+        elif not survivals[count]:
+            match &= ~words
+
+        result |= match
+
+    return result
+
+
+def full_adder(a: np.ndarray, b: np.ndarray, c: np.ndarray):
+    """Add three bit planes.
+
+    Returns
+    -------
+    `tuple` [numpy.ndarray, numpy.ndarray]
+        Sum and carry bit planes.
+    """
+    half = a ^ b
+    return half ^ c, (a & b) | (half & c)
+
+
+def last_word_mask(width: int) -> np.uint64:
+    """Mask of the bits of the last word of a row that hold cells."""
+    used = width % WORD_SIZE or WORD_SIZE
+    return np.uint64((1 << used) - 1)
+
+
+def shift_west(words: np.ndarray, width: int, wrap: bool) -> np.ndarray:
+    """Move every cell one column to the right.
+
+    Each cell of the result holds the value of its western neighbor.
+    """
+    last_bit = np.uint64((width - 1) % WORD_SIZE)
+
+    out = words << np.uint64(1)
+    out[:, 1:] |= words[:, :-1] >> np.uint64(WORD_SIZE - 1)
+    if wrap:
+        out[:, 0] |= (words[:, -1] >> last_bit) & np.uint64(1)
+
+    out[:, -1] &= last_word_mask(width)
+    return out
+
+
+def shift_east(words: np.ndarray, width: int, wrap: bool) -> np.ndarray:
+    """Move every cell one column to the left.
+
+    Each cell of the result holds the value of its eastern neighbor.
+    """
+    last_bit = np.uint64((width - 1) % WORD_SIZE)
+
+    out = words >> np.uint64(1)
+    out[:, :-1] |= words[:, 1:] << np.uint64(WORD_SIZE - 1)
+    if wrap:
+        out[:, -1] |= (words[:, 0] & np.uint64(1)) << last_bit
+
+    return out
+
+
+def shift_north(words: np.ndarray, wrap: bool) -> np.ndarray:
+    """Move every row one row down.
+
+    Each row of the result holds the row to its north.
+    """
+    if wrap:
+        return np.roll(words, 1, axis=0)
+
+    out = np.zeros_like(words)
+    out[1:] = words[:-1]
+    return out
+
+
+def shift_south(words: np.ndarray, wrap: bool) -> np.ndarray:
+    """Move every row one row up.
+
+    Each row of the result holds the row to its south.
+    """
+    if wrap:
+        return np.roll(words, -1, axis=0)
+
+    out = np.zeros_like(words)
+    out[:-1] = words[1:]
+    return out
+
+
+def _bounds(grid: BitGrid) -> Optional[Tuple[int, int, int, int]]:
+    """Bounding box of the living cells of a grid, see ``Stats``."""
+    words = grid.words
+    cols = unpack(np.bitwise_or.reduce(words, axis=0)[None], grid.width)[0]
+    return bounding_box(words.any(axis=1), cols)
+
+
+def _count_bits(words: np.ndarray) -> int:
+    """Count the set bits of ``uint64`` words."""
+    return int(np.count_nonzero(np.unpackbits(words.view(np.uint8))))
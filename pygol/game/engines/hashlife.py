@@ -0,0 +1,416 @@
+"""HashLife simulation engine"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple
+
+from ..compile import transition_table
+from .base import Engine, Window
+
+if TYPE_CHECKING:
+    from pygol.game import Game
+
+
+class Node:
+    """Quadtree node.
+
+    Nodes are hash-consed by ``HashLifeEngine``: two nodes of the same engine
+    representing the same pattern are the same object. Nodes must therefore be
+    created using ``HashLifeEngine.join`` and never be modified.
+
+    Parameters
+    ----------
+    k: int
+        Level of the node. A node of level ``k`` represents a square of
+        ``2**k`` by ``2**k`` cells.
+    a, b, c, d: Node
+        North-west, north-east, south-west and south-east quadrants of the
+        node. ``None`` for nodes of level ``0``.
+    n: int
+        Population of the node.
+
+    Attributes
+    ----------
+    h: int
+        Hash of the pattern of the node. Unlike the identity of a node, it
+        stays the same when the node is collected and created again.
+    """
+
+    __slots__ = ("k", "a", "b", "c", "d", "n", "h")
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, k: int, a: Node, b: Node, c: Node, d: Node, n: int):
+        self.k = k
+        self.a = a
+        self.b = b
+        self.c = c
+        self.d = d
+        self.n = n
+        self.h = n if a is None else hash((a.h, b.h, c.h, d.h))
+
+
+#: Living cell (level ``0`` node)
+ON = Node(0, None, None, None, None, 1)
+#: Dead cell (level ``0`` node)
+OFF = Node(0, None, None, None, None, 0)
+
+
+class QuadGrid(Window):
+    """Window of a ``HashLifeEngine`` universe.
+
+    Cells outside of the window are kept in the quadtree and are still
+    simulated.
+
+    Parameters
+    ----------
+    root: Node
+        Root node of the universe. The center of the root node is the origin of
+        the universe.
+    origin: `tuple` [int, int]
+        Coordinates of the top left corner of the window in the universe.
+    width, height: int
+        Width and height of the window.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, root: Node, origin: Tuple[int, int],
+                 width: int, height: int):
+        super().__init__(origin, width, height)
+        self.root = root
+
+    def __getstate__(self):
+        # Only send the visible window, e.g. to display processes
+        return {**self.__dict__, "root": None, "_rows": self.rows}
+
+    def paint(self, rows: List[List[int]]) -> None:
+        half = 1 << self.root.k >> 1
+        paint_node(self.root, -half - self.origin[0], -half - self.origin[1],
+                   rows)
+
+
+def paint_node(node: Node, x: int, y: int, rows: List[List[int]]) -> None:
+    """Write the living cells of a node into a grid.
+
+    Parameters
+    ----------
+    node: Node
+        Node to paint.
+    x, y: int
+        Coordinates of the top left corner of the node in the grid.
+    rows: `list` [`list` [int]]
+        Grid to paint into. Cells outside of the grid are skipped.
+    """
+    size = 1 << node.k
+    height, width = len(rows), len(rows[0]) if rows else 0
+
+    if not node.n or x >= width or y >= height or x + size <= 0 or y + size <= 0:
+        return
+
+    if node.k == 0:
+        rows[y][x] = 1
+        return
+
+    half = size >> 1
+    paint_node(node.a, x, y, rows)
+    paint_node(node.b, x + half, y, rows)
+    paint_node(node.c, x, y + half, rows)
+    paint_node(node.d, x + half, y + half, rows)
+
+
+class HashLifeEngine(Engine):
+    """HashLife simulation engine.
+
+    The universe is stored as a quadtree of hash-consed nodes. The future of
+    every node is memoized, so repetitive patterns (e.g. guns or oscillators)
+    are only ever computed once. The engine can advance the universe by
+    ``2**j`` generations in a single step, making runs to generation ``10**9``
+    and beyond feasible.
+
+    Parameters
+    ----------
+    max_nodes: int, optional
+        Upper bound on the amount of cached nodes and results. When the cache
+        grows beyond this bound after a step, all results are dropped and only
+        the nodes of the current universe are kept. Defaults to ``2**20``.
+
+    Attributes
+    ----------
+    nodes: `dict` [`tuple` [Node, Node, Node, Node], Node]
+        Hash-consing table mapping the quadrants of a node to the node.
+    results: `dict` [`tuple` [Node, int], Node]
+        Memoized futures of nodes, indexed by node and step exponent ``j``.
+
+    Notes
+    -----
+    HashLife simulates an unbounded universe. The grid of the ``Game`` is a
+    window onto this universe: cells leaving the window keep evolving and may
+    re-enter it later. ``Game.wrap`` is therefore ignored by this engine.
+
+    This engine only supports totalistic rules that do not give birth to cells
+    without any living neighbors.
+
+    References
+    ----------
+    Find HashLife in the LifeWiki:
+    https://www.conwaylife.com/wiki/HashLife
+    """
+
+    def __init__(self, max_nodes: int = 1 << 20):
+        self.max_nodes = max_nodes
+        self.nodes: Dict[Tuple[Node, Node, Node, Node], Node] = {}
+        self.results: Dict[Tuple[Node, int], Node] = {}
+        self._empty = [OFF]
+        self._table = None
+
+    def __getstate__(self):
+        # Caches stay with the simulation process, e.g. when sending games to
+        # display processes
+        return {**super().__getstate__(), "nodes": {}, "results": {}, "_empty": [OFF]}
+
+    def join(self, a: Node, b: Node, c: Node, d: Node) -> Node:
+        """Get the node made of four quadrants.
+
+        Parameters
+        ----------
+        a, b, c, d: Node
+            North-west, north-east, south-west and south-east quadrants.
+
+        Returns
+        -------
+        Node
+            Canonical node of these quadrants.
+        """
+        key = a, b, c, d
+        node = self.nodes.get(key)
+
+        if node is None:
+            node = Node(a.k + 1, a, b, c, d, a.n + b.n + c.n + d.n)
+            self.nodes[key] = node
+
+        return node
+
+    def empty(self, k: int) -> Node:
+        """Get the empty node of level ``k``."""
+        while len(self._empty) <= k:
+            e = self._empty[-1]
+            self._empty.append(self.join(e, e, e, e))
+
+        return self._empty[k]
+
+    def centre(self, node: Node) -> Node:
+        """Surround a node with empty space, keeping its center in place.
+
+        Returns
+        -------
+        Node
+            Node of level ``node.k + 1``.
+        """
+        e = self.empty(node.k - 1)
+        return self.join(self.join(e, e, e, node.a), self.join(e, e, node.b, e),
+                         self.join(e, node.c, e, e), self.join(node.d, e, e, e))
+
+    def build(self, cells: Iterable[Tuple[int, int]], k: int,
+              x: int = 0, y: int = 0) -> Node:
+        """Build a node from living cells.
+
+        Parameters
+        ----------
+        cells: `iterable` [`tuple` [int, int]]
+            Coordinates of living cells.
+        k: int
+            Level of the node to build.
+        x, y: int, optional
+            Coordinates of the top left corner of the node. Cells outside of
+            the node are ignored.
+
+        Returns
+        -------
+        Node
+            Node of level ``k``.
+        """
+        size = 1 << k
+        cells = [(cx, cy) for cx, cy in cells
+                 if x <= cx < x + size and y <= cy < y + size]
+
+        if not cells:
+            return self.empty(k)
+        if k == 0:
+            return ON
+
+        half = size >> 1
+        return self.join(self.build(cells, k - 1, x, y),
+                         self.build(cells, k - 1, x + half, y),
+                         self.build(cells, k - 1, x, y + half),
+                         self.build(cells, k - 1, x + half, y + half))
+
+    def successor(self, node: Node, j: int) -> Node:
+        """Compute the center of a node ``2**j`` generations ahead.
+
+        Parameters
+        ----------
+        node: Node
+            Node of level ``k >= 2``.
+        j: int
+            Step exponent. Values greater than ``k - 2`` are clamped to
+            ``k - 2``.
+
+        Returns
+        -------
+        Node
+            Center of the node of level ``k - 1`` after ``2**j`` generations.
+        """
+        j = min(j, node.k - 2)
+
+        if not node.n:
+            return node.a
+
+        key = node, j
+        result = self.results.get(key)
+        if result is not None:
+            return result
+
+        if node.k == 2:
+            result = self._life_4x4(node)
+        else:
+            result = self._successor(node, j)
+
+        self.results[key] = result
+        return result
+
+    def _successor(self, m: Node, j: int) -> Node:
+        join, succ = self.join, self.successor
+
+        # Nine overlapping sub-nodes of level k - 1, advanced by 2**j or
+        # 2**(k - 3) generations
+        c1 = succ(join(m.a.a, m.a.b, m.a.c, m.a.d), j)
+        c2 = succ(join(m.a.b, m.b.a, m.a.d, m.b.c), j)
+        c3 = succ(join(m.b.a, m.b.b, m.b.c, m.b.d), j)
+        c4 = succ(join(m.a.c, m.a.d, m.c.a, m.c.b), j)
+        c5 = succ(join(m.a.d, m.b.c, m.c.b, m.d.a), j)
+        c6 = succ(join(m.b.c, m.b.d, m.d.a, m.d.b), j)
+        c7 = succ(join(m.c.a, m.c.b, m.c.c, m.c.d), j)
+        c8 = succ(join(m.c.b, m.d.a, m.c.d, m.d.c), j)
+        c9 = succ(join(m.d.a, m.d.b, m.d.c, m.d.d), j)
+
+        if j < m.k - 2:
+            return join(join(c1.d, c2.c, c4.b, c5.a), join(c2.d, c3.c, c5.b, c6.a),
+                        join(c4.d, c5.c, c7.b, c8.a), join(c5.d, c6.c, c8.b, c9.a))
+
+        return join(succ(join(c1, c2, c4, c5), j), succ(join(c2, c3, c5, c6), j),
+                    succ(join(c4, c5, c7, c8), j), succ(join(c5, c6, c8, c9), j))
+
+    def _life_4x4(self, m: Node) -> Node:
+        births, survivals = self._table
+        grid = (
+            (m.a.a.n, m.a.b.n, m.b.a.n, m.b.b.n),
+            (m.a.c.n, m.a.d.n, m.b.c.n, m.b.d.n),
+            (m.c.a.n, m.c.b.n, m.d.a.n, m.d.b.n),
+            (m.c.c.n, m.c.d.n, m.d.c.n, m.d.d.n),
+        )
+
+        def cell(x, y):
+            live_count = sum(grid[y + dy][x + dx]
+                             for dy in (-1, 0, 1) for dx in (-1, 0, 1)) - grid[y][x]
+            table = survivals if grid[y][x] else births
+            return ON if table[live_count] else OFF
+
+        return self.join(cell(1, 1), cell(2, 1), cell(1, 2), cell(2, 2))
+
+    def collect(self, root: Node) -> None:
+        """Drop all memoized results and all nodes not used by ``root``.
+
+        Parameters
+        ----------
+        root: Node
+            Root node of the universe to keep.
+        """
+        self.results.clear()
+        nodes = {}
+
+        stack = [root, *self._empty]
+        while stack:
+            node = stack.pop()
+            if node.k == 0:
+                continue
+
+            key = node.a, node.b, node.c, node.d
+            if key not in nodes:
+                nodes[key] = node
+                stack.extend(key)
+
+        self.nodes = nodes
+
+    def load(self, game: Game) -> QuadGrid:
+        if isinstance(game.matrix, QuadGrid) and game.matrix.root is not None:
+            return game.matrix
+
+        # The root is centered on the origin, the grid lies in its south-east
+        # quadrant
+        k = max(game.width, game.height, 2).bit_length() + 1
+        half = 1 << k >> 1
+        cells = [(x, y) for y, row in enumerate(game.matrix)
+                 for x, col in enumerate(row) if col]
+
+        return QuadGrid(self.build(cells, k, -half, -half), (0, 0),
+                        game.width, game.height)
+
+    def dump(self, game: Game) -> List[List[int]]:
+        return [list(row) for row in self.load(game)]
+
+    def fingerprint(self, game: Game) -> int:
+        node, origin = self.snapshot(game)
+        return hash((node.k, node.h, origin))
+
+    def snapshot(self, game: Game) -> Tuple[Node, Tuple[int, int]]:
+        grid = self.load(game)
+        node = grid.root
+
+        # Roots are padded to varying levels, strip the empty padding first.
+        # Nodes are never duplicated, so equal universes share their node.
+        while node.k > 1:
+            inner = self.join(node.a.d, node.b.c, node.c.b, node.d.a)
+            if inner.n != node.n:
+                break
+            node = inner
+
+        return node, grid.origin
+
+    def population(self, game: Game) -> int:
+        return self.load(game).root.n
+
+    def tick(self, game: Game) -> QuadGrid:
+        return self.advance(game, 1)
+
+    def advance(self, game: Game, generations: int) -> QuadGrid:
+        grid = self.load(game)
+        root = grid.root
+
+        table = transition_table(game.rule)
+        if table[0][0]:
+            raise ValueError("HashLife does not support rules with B0")
+
+        if table != self._table:
+            # Memoized results are only valid for the rule they were computed
+            # with
+            self.results.clear()
+            self._table = table
+
+        for j in range(generations.bit_length()):
+            if not generations >> j & 1:
+                continue
+
+            # Keep the pattern in the innermost sixteenth of the root, so it
+            # cannot escape the center of the root within 2**j generations
+            while root.k < j + 3 or not is_padded(root):
+                root = self.centre(root)
+
+            root = self.successor(root, j)
+
+        if len(self.nodes) + len(self.results) > self.max_nodes:
+            self.collect(root)
+
+        return QuadGrid(root, grid.origin, game.width, game.height)
+
+
+def is_padded(node: Node) -> bool:
+    """Whether all living cells of a node lie within its innermost sixteenth."""
+    return node.n == node.a.d.d.n + node.b.c.c.n + node.c.b.b.n + node.d.a.a.n
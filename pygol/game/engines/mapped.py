@@ -0,0 +1,284 @@
+"""Out-of-core simulation engine"""
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import tempfile
+import weakref
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from ..compile import LargerThanLifeRule
+from ..rules import Signature, rule_string
+from .base import Engine, Stats
+from .vectorized import bounding_box, step
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+if TYPE_CHECKING:
+    from pygol.game import Game
+
+#: Name of the file holding the header of a universe
+HEADER = "universe.json"
+#: Names of the two files holding the cells of a universe
+BUFFERS = ("cells-0.u8", "cells-1.u8")
+
+
+class MappedEngine(Engine):
+    """Out-of-core simulation engine.
+
+    The grid is stored as ``uint8`` cells in two memory-mapped files (see
+    ``mmap``), which take turns holding the current generation. Every tick
+    streams the current generation through memory in strips of
+    ``strip_height`` rows, together with the halo rows bordering them, and
+    writes the next generation of every strip into the other file. The pages
+    of a strip are released as soon as it is computed, so resident memory is
+    bounded by the strip size, no matter how large the universe is.
+
+    A small JSON header next to the cells records the size, edge handling,
+    rule and generation of the universe, as well as which file holds the
+    current generation. It is only replaced once a generation is complete, so
+    a universe can always be reopened using ``restore()``, even after the
+    process was killed during a tick.
+
+    Parameters
+    ----------
+    path: str, optional
+        Directory holding the files of the universe. It is created if it does
+        not exist. If not specified, a temporary directory is used, which is
+        deleted along with the engine.
+    strip_height: int, optional
+        Amount of rows computed at once. Defaults to ``256``.
+
+    Notes
+    -----
+    The grid of the game is a NumPy array mapping one of the files, which is
+    reused two ticks later. Copy it to keep a generation around.
+
+    Like the ``numpy`` engine, this engine supports totalistic rules and all
+    compiled rules (see ``compile.compile_rule``). Only compiled rules are
+    recorded in the header; other rules must be passed to ``restore()``.
+
+    Raises
+    ------
+    ImportError
+        If NumPy is not installed.
+
+    Examples
+    --------
+    Continue the simulation of a universe in a later process
+
+    >>> conw = Game(100_000, 100_000, seed, engine=MappedEngine("universe"))
+    >>> conw.skip(100)
+    >>> # ... later on
+    >>> conw = MappedEngine("universe").restore()
+    >>> print(conw.generation)
+    100
+
+    """
+
+    def __init__(self, path: str = None, strip_height: int = 256):
+        if np is None:
+            raise ImportError("The mapped engine requires NumPy to be installed")
+
+        if path is None:
+            path = tempfile.mkdtemp(prefix="pygol-")
+            weakref.finalize(self, shutil.rmtree, path, True)
+
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.strip_height = strip_height
+        self.header: Optional[Dict[str, Any]] = None
+        self._buffers = [None, None]
+
+    def __getstate__(self):
+        # Mapped files stay with the simulation process
+        return {**super().__getstate__(), "_buffers": [None, None]}
+
+    def restore(self, rule: Signature = None, **kwargs) -> Game:
+        """Reopen the universe stored in ``path``.
+
+        Parameters
+        ----------
+        rule: `union` [`Rule Func`, str], optional
+            Rule of the game. Defaults to the rule recorded in the header.
+            Required if the universe was simulated using an uncompiled rule
+            function.
+        **kwargs
+            Further keyword arguments passed to ``Game``, e.g. ``alive``.
+
+        Returns
+        -------
+        Game
+            Game continuing the simulation at the recorded generation.
+
+        Raises
+        ------
+        FileNotFoundError
+            If there is no universe stored in ``path``.
+        ValueError
+            If no rule is given and none is recorded in the header.
+        """
+        # pylint: disable=import-outside-toplevel
+        from pygol.game import Game  # The game imports the engines
+
+        with open(os.path.join(self.path, HEADER), encoding="utf-8") as file:
+            self.header = json.load(file)
+
+        header = self.header
+        rule = rule or header["rule"]
+        if rule is None:
+            raise ValueError("The rule of the universe is not recorded, pass "
+                             "it to restore()")
+
+        shape = header["height"], header["width"]
+        self._buffers = [self._open(name, shape, False) for name in BUFFERS]
+
+        game = Game(header["width"], header["height"],
+                    self._buffers[header["current"]], wrap=header["wrap"],
+                    rule=rule, engine=self, **kwargs)
+        game.generation = header["generation"]
+        return game
+
+    def load(self, game: Game) -> np.ndarray:
+        if any(game.matrix is buffer for buffer in self._buffers):
+            return game.matrix
+
+        shape = game.height, game.width
+        self._buffers = [self._open(name, shape, True) for name in BUFFERS]
+        grid = self._buffers[0]
+
+        for start in range(0, game.height, self.strip_height):
+            stop = start + self.strip_height
+            grid[start:stop] = np.asarray(game.matrix[start:stop], dtype=np.uint8)
+            _release(grid, start, stop)
+
+        grid.base.flush()
+        self.header = {"generation": game.generation, "current": 0}
+        self._save(game)
+        return grid
+
+    def dump(self, game: Game) -> List[List[int]]:
+        return self.load(game).tolist()
+
+    def fingerprint(self, game: Game) -> int:
+        return int.from_bytes(self._digest(game, 8), "little", signed=True)
+
+    def snapshot(self, game: Game) -> bytes:
+        # Copies of the grid would not fit into memory
+        return self._digest(game, 32)
+
+    def _digest(self, game: Game, size: int) -> bytes:
+        """Hash the grid of a game strip by strip into ``size`` bytes."""
+        grid = self.load(game)
+        digest = hashlib.blake2b(digest_size=size)
+
+        for start in range(0, game.height, self.strip_height):
+            digest.update(grid[start:start + self.strip_height].tobytes())
+
+        return digest.digest()
+
+    def population(self, game: Game) -> int:
+        grid = self.load(game)
+        strips = range(0, game.height, self.strip_height)
+        return sum(int(np.count_nonzero(grid[start:start + self.strip_height] == 1))
+                   for start in strips)
+
+    def stats(self, game: Game, previous: Any = None) -> Stats:
+        grid = self.load(game)
+        births = deaths = population = 0
+        rows, cols = [], np.zeros(game.width, dtype=bool)
+
+        for start in range(0, game.height, self.strip_height):
+            stop = start + self.strip_height
+            alive = grid[start:stop] == 1
+            population += int(np.count_nonzero(alive))
+            rows.append(alive.any(axis=1))
+            cols |= alive.any(axis=0)
+
+            if previous is not None:
+                before = np.asarray(previous[start:stop]) == 1
+                changed = alive != before
+                births += int(np.count_nonzero(changed & alive))
+                deaths += int(np.count_nonzero(changed & before))
+
+            _release(grid, start, stop)
+
+        if previous is None:
+            births = deaths = None
+
+        return Stats(game.generation, population, births, deaths,
+                     bounding_box(np.concatenate(rows), cols))
+
+    def tick(self, game: Game) -> np.ndarray:
+        source = self.load(game)
+        target = self._buffers[1] if source is self._buffers[0] else self._buffers[0]
+        height, rule = game.height, game.rule
+        halo = rule.radius if isinstance(rule, LargerThanLifeRule) else 1
+
+        for start in range(0, height, self.strip_height):
+            stop = min(start + self.strip_height, height)
+            rows = np.arange(start - halo, stop + halo)
+
+            if game.wrap:
+                strip = source[rows % height]
+            else:
+                inside = (rows >= 0) & (rows < height)
+                strip = np.zeros((len(rows), game.width), dtype=np.uint8)
+                strip[inside] = source[rows[inside]]
+
+            # Rows computed from the edges of the strip are dropped
+            cells = step(strip, rule, game.wrap)
+            target[start:stop] = cells[halo:halo + stop - start]
+
+            _release(source, start, stop)
+            _release(target, start, stop)
+
+        target.base.flush()
+        self.header["generation"] += 1
+        self.header["current"] = int(target is self._buffers[1])
+        self._save(game)
+        return target
+
+    def _open(self, name: str, shape: Tuple[int, int],
+              create: bool) -> np.ndarray:
+        """Map one of the files holding the cells of the universe."""
+        size = max(shape[0] * shape[1], 1)
+
+        with open(os.path.join(self.path, name), "w+b" if create else "r+b") as file:
+            if create:
+                file.truncate(size)
+            memory = mmap.mmap(file.fileno(), size)
+
+        return np.ndarray(shape, dtype=np.uint8, buffer=memory)
+
+    def _save(self, game: Game) -> None:
+        """Atomically replace the header of the universe."""
+        self.header.update(width=game.width, height=game.height,
+                           wrap=game.wrap, rule=rule_string(game.rule))
+
+        path = os.path.join(self.path, HEADER)
+        with open(path + ".tmp", "w", encoding="utf-8") as file:
+            json.dump(self.header, file)
+        os.replace(path + ".tmp", path)
+
+
+def _release(buffer: np.ndarray, start: int, stop: int) -> None:
+    """Drop the pages holding rows of a mapped buffer from resident memory.
+
+    Modified pages stay in the page cache and are still written to the file.
+    """
+    if not hasattr(mmap, "MADV_DONTNEED"):  # pragma: no cover
+        return
+
+    width = buffer.shape[1]
+    first = start * width // mmap.PAGESIZE * mmap.PAGESIZE
+    last = min(stop, len(buffer)) * width
+
+    if last > first:
+        buffer.base.madvise(mmap.MADV_DONTNEED, first, last - first)
@@ -0,0 +1,261 @@
+"""Multi-process simulation engine"""
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import weakref
+from multiprocessing.connection import Connection, wait
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import Barrier
+from threading import BrokenBarrierError
+from typing import TYPE_CHECKING, Any, List, Tuple
+
+from ..compile import transition_table
+from .vectorized import NumpyEngine, next_generation
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+if TYPE_CHECKING:
+    from pygol.game import Game
+
+
+class ParallelEngine(NumpyEngine):
+    """Multi-process simulation engine.
+
+    The grid is stored like in the ``numpy`` engine, and split into horizontal
+    strips, one per worker process. The grid is double-buffered in two
+    ``multiprocessing.shared_memory`` blocks: every generation, each worker
+    reads its strip and the halo rows bordering it from one buffer and writes
+    the next generation of its strip into the other. A barrier keeps the
+    workers in lockstep between generations.
+
+    Parameters
+    ----------
+    processes: int, optional
+        Amount of worker processes. Defaults to the amount of CPUs.
+
+    Notes
+    -----
+    The workers are started on the first tick and restarted whenever the size
+    of the grid changes. Call ``close()`` to stop them early; they are stopped
+    automatically when the engine is garbage collected.
+
+    The grid returned by a tick is a view onto shared memory, which is reused
+    two ticks later. Copy it to keep a generation around.
+
+    If a worker fails, the barrier is broken so that no process keeps waiting
+    for it, the workers are stopped, and the error of the worker is raised by
+    the tick.
+
+    This engine only supports totalistic rules, i.e. rules that solely depend
+    on the state of a cell and the amount of living neighbors.
+
+    Raises
+    ------
+    ImportError
+        If NumPy is not installed.
+    """
+
+    def __init__(self, processes: int = None):
+        if np is None:
+            raise ImportError("The parallel engine requires NumPy to be installed")
+
+        super().__init__()
+        self.processes = processes or os.cpu_count()
+        self._workers = None
+        self._current = None
+
+    def __getstate__(self):
+        # Workers and shared memory stay with the simulation process
+        return {**super().__getstate__(), "_workers": None, "_current": None}
+
+    def close(self) -> None:
+        """Stop the worker processes and free the shared memory."""
+        if self._workers is not None:
+            self._workers.close()
+
+        self._workers = None
+        self._current = None
+
+    def tick(self, game: Game) -> np.ndarray:
+        return self.advance(game, 1)
+
+    def advance(self, game: Game, generations: int) -> np.ndarray:
+        grid = self.load(game)
+
+        if self._workers is None or self._workers.shape != grid.shape:
+            self.close()
+            self._workers = _Workers(grid.shape, self.processes)
+
+        workers = self._workers
+        if grid is not self._current:
+            workers.buffers[workers.source][:] = grid
+
+        table = transition_table(game.rule)
+        for conn in workers.conns:
+            conn.send((generations, workers.source, table, game.wrap))
+
+        results = workers.collect()
+        errors = [result for result in results
+                  if isinstance(result, BaseException)]
+        if errors:
+            self.close()
+            # Errors of the failed worker come before the errors of the workers
+            # released from the barrier
+            errors.sort(key=lambda error: isinstance(error, BrokenBarrierError))
+            raise errors[0]
+
+        workers.source = results[0]
+        self._current = workers.buffers[workers.source]
+        return self._current
+
+
+class _Workers:
+    """Worker processes and shared buffers of a ``ParallelEngine``."""
+
+    def __init__(self, shape: Tuple[int, int], processes: int):
+        height, width = shape
+        processes = max(min(processes, height), 1)
+
+        self.shape = shape
+        self.source = 0
+        self.memory = [SharedMemory(create=True, size=max(height * width, 1))
+                       for _ in range(2)]
+        self.buffers = [np.ndarray(shape, dtype=np.uint8, buffer=memory.buf)
+                        for memory in self.memory]
+
+        self.barrier = barrier = mp.Barrier(processes)
+        bounds = [height * i // processes for i in range(processes + 1)]
+        names = [memory.name for memory in self.memory]
+
+        self.conns = []
+        children = []
+        for start, stop in zip(bounds, bounds[1:]):
+            conn, worker_conn = mp.Pipe()
+            process = mp.Process(
+                target=_work, daemon=True,
+                args=(names, shape, start, stop, barrier, worker_conn))
+            process.start()
+            # Only the worker holds its end, so its exit is noticed
+            worker_conn.close()
+
+            self.conns.append(conn)
+            children.append(process)
+
+        self._finalizer = weakref.finalize(
+            self, _shutdown, self.conns, children, self.memory)
+
+    def collect(self) -> List[Any]:
+        """Receive the result of every worker.
+
+        Returns
+        -------
+        `list` [`Any`]
+            Index of the buffer holding the last generation, or the error
+            raised by the worker.
+        """
+        results = [None] * len(self.conns)
+        pending = list(self.conns)
+
+        # Results are received as they arrive, as workers only report back
+        # once the failure of another worker released them from the barrier
+        while pending:
+            for conn in wait(pending):
+                try:
+                    result = conn.recv()
+                except EOFError:
+                    result = RuntimeError("A worker of the parallel engine "
+                                          "exited unexpectedly")
+
+                if isinstance(result, BaseException):
+                    self.barrier.abort()
+
+                results[self.conns.index(conn)] = result
+                pending.remove(conn)
+
+        return results
+
+    def close(self) -> None:
+        """Stop the worker processes and free the shared memory."""
+        # Drop the views onto the shared memory before closing it
+        self.buffers = []
+        self._finalizer()
+
+
+def _shutdown(conns: List[Connection], processes: List[mp.Process],
+              memory: List[SharedMemory]) -> None:
+    for conn in conns:
+        try:
+            conn.send(None)
+        except OSError:
+            # The worker already exited
+            pass
+    for process in processes:
+        process.join()
+    for block in memory:
+        try:
+            block.close()
+        except BufferError:
+            # Grids returned by the engine may still be in use
+            pass
+        block.unlink()
+
+
+# pylint: disable=too-many-arguments
+def _work(names: List[str], shape: Tuple[int, int], start: int, stop: int,
+          barrier: Barrier, conn: Connection) -> None:
+    """Compute the strip ``start:stop`` of the grid on command."""
+    memory = [SharedMemory(name=name) for name in names]
+    buffers = [np.ndarray(shape, dtype=np.uint8, buffer=block.buf)
+               for block in memory]
+
+    while True:
+        command = conn.recv()
+        if command is None:
+            break
+
+        try:
+            conn.send(_run(command, buffers, start, stop, barrier))
+        except Exception as error:  # pylint: disable=broad-except
+            # Release the other workers and let the engine raise the error
+            barrier.abort()
+            conn.send(error)
+
+    del buffers
+    for block in memory:
+        block.close()
+
+
+def _run(command: Tuple[int, int, Any, bool], buffers: List[np.ndarray],
+         start: int, stop: int, barrier: Barrier) -> int:
+    """Compute the generations of a command, returning the final buffer."""
+    generations, source, table, wrap = command
+    table = np.array(table, dtype=np.uint8)
+
+    for _ in range(generations):
+        strip = _halo_strip(buffers[source], start, stop, wrap)
+        buffers[1 - source][start:stop] = next_generation(strip, table)
+
+        # Wait for all strips before the next generation reads the halos
+        barrier.wait()
+        source = 1 - source
+
+    return source
+
+
+def _halo_strip(grid: np.ndarray, start: int, stop: int,
+                wrap: bool) -> np.ndarray:
+    """Rows ``start:stop`` of the grid, surrounded by a border of one cell."""
+    height, width = grid.shape
+
+    if wrap:
+        strip = grid.take(range(start - 1, stop + 1), axis=0, mode="wrap")
+        return np.pad(strip, ((0, 0), (1, 1)), mode="wrap")
+
+    strip = np.zeros((stop - start + 2, width + 2), dtype=np.uint8)
+    top, bottom = max(start - 1, 0), min(stop + 1, height)
+    strip[top - start + 1:bottom - start + 1, 1:-1] = grid[top:bottom]
+    return strip
@@ -0,0 +1,210 @@
+"""Pure Python simulation engine"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Iterator, List, Tuple, Union
+
+from pygol.utils import Grid
+from pygol.utils.matrix import ALIVE
+
+from ..compile import (GenerationsRule, IsotropicRule, LargerThanLifeRule,
+                       TotalisticRule)
+from .base import Engine, RowCensus
+
+if TYPE_CHECKING:
+    from pygol.game import Game
+
+
+class PythonEngine(Engine):
+    """Pure Python simulation engine.
+
+    Computes every cell of the grid, one cell at a time. Compiled rules (see
+    ``compile.compile_rule``) are looked up in their transition table, other rule
+    functions are called for every cell. This engine supports every rule
+    function, Generations rule and isotropic rule, but is slow on large grids.
+    Larger than Life rules require the ``numpy`` engine.
+
+    The engine keeps two preallocated ``Grid`` buffers and alternates between
+    them: every tick writes the next generation into the grid holding the
+    previous generation. Grids store one byte per cell, but are slower to index
+    than lists. Every row is therefore read into a list once, and every row of
+    the next generation is computed in a list and then copied into the grid at
+    once. Memory stays flat during long runs. The statistics of the next
+    generation are collected from these rows as well (see ``Engine.tally``).
+
+    Notes
+    -----
+    The grid returned by a tick is reused two ticks later. Copy it to keep a
+    generation around. Grids not created by the engine, e.g. the seed of the
+    game, are never written to.
+
+    Rule functions receive an empty ``neighbors`` iterator.
+    """
+
+    def __init__(self):
+        self._buffers = [None, None]
+        self._size = None
+        self._scratch = None
+
+    def __getstate__(self):
+        # Buffers stay with the simulation process
+        return {**super().__getstate__(), "_buffers": [None, None], "_size": None,
+                "_scratch": None}
+
+    def load(self, game: Game) -> Union[Grid, List[List[int]]]:
+        if isinstance(game.matrix, (Grid, list)):
+            return game.matrix
+
+        return self.dump(game)
+
+    def tick(self, game: Game) -> Grid:
+        cells = self.load(game)
+        grid = self._target(cells, game.width, game.height)
+
+        rule = game.rule
+        if isinstance(rule, LargerThanLifeRule):
+            raise ValueError("The python engine does not support Larger than "
+                             "Life rules, use the numpy engine")
+
+        # Vertical sums of each column and the columns beyond the edges, and
+        # the next generation of a row
+        sums, out = self._scratch
+        census = RowCensus(game.height)
+        columns = _column_bits if isinstance(rule, IsotropicRule) else _column_sums
+        fill, table = _row_rule(rule)
+
+        # Only fully alive cells are counted as neighbors
+        live = cells
+        if isinstance(rule, GenerationsRule):
+            live = [bytes(row).translate(ALIVE) for row in cells]
+
+        for y, near in enumerate(_rows(live, game.wrap)):
+            columns(sums, *near, game.wrap)
+            fill(out, sums, near[1] if live is cells else list(cells[y]), near[1],
+                 table)
+
+            line = bytes(out)
+            grid[y] = line
+            census.update(y, bytes(live[y]).translate(ALIVE), line.translate(ALIVE))
+
+        self.tally = census.tally(grid)
+        return grid
+
+    def _target(self, cells: Union[Grid, List[List[int]]], width: int,
+                height: int) -> Grid:
+        """Get the buffer to write the next generation into."""
+        if self._size != (width, height):
+            self._buffers = [None, None]
+            self._size = width, height
+            self._scratch = [0] * (width + 2), [0] * width
+
+        # Alternate between the buffers, but never overwrite foreign grids
+        index = 1 if cells is self._buffers[0] else 0
+        target = self._buffers[index]
+        if target is None:
+            target = self._buffers[index] = Grid(width, height)
+
+        return target
+
+
+def _rows(live: Union[Grid, List[List[int]]],
+          wrap: bool) -> Iterator[Tuple[List[int], List[int], List[int]]]:
+    """Read every row of a grid as a list, along with the rows around it."""
+    if not live:
+        return
+
+    first = list(live[0])
+    zeros = [0] * len(first)
+    above, alive = list(live[-1]) if wrap else zeros, first
+
+    for y in range(1, len(live) + 1):
+        if y < len(live):
+            below = list(live[y])
+        else:
+            below = first if wrap else zeros
+
+        yield above, alive, below
+        above, alive = alive, below
+
+
+def _column_sums(sums: List[int], above: List[int], alive: List[int],
+                 below: List[int], wrap: bool) -> None:
+    """Sum the columns of three rows into ``sums``, padded by one column."""
+    width = len(alive)
+    for x in range(width):
+        sums[x + 1] = above[x] + alive[x] + below[x]
+
+    _pad(sums, width, wrap)
+
+
+def _column_bits(sums: List[int], above: List[int], alive: List[int],
+                 below: List[int], wrap: bool) -> None:
+    """Encode the columns of three rows into ``sums``, padded by one column."""
+    width = len(alive)
+    for x in range(width):
+        sums[x + 1] = above[x] | alive[x] << 3 | below[x] << 6
+
+    _pad(sums, width, wrap)
+
+
+def _pad(sums: List[int], width: int, wrap: bool) -> None:
+    """Fill in the columns beyond the edges of a row."""
+    if wrap:
+        sums[0], sums[width + 1] = sums[width], sums[1]
+    else:
+        sums[0] = sums[width + 1] = 0
+
+
+def _row_rule(rule: Any) -> Tuple[Callable[..., None], Any]:
+    """Select the function computing a row of the next generation.
+
+    Returns
+    -------
+    `tuple` [`callable`, `Any`]
+        Row function and the table (or rule function) to pass to it. Row
+        functions receive the next generation of the row to fill in, the
+        column sums of the row, the states of the row, whether its cells are
+        fully alive and the table.
+    """
+    if isinstance(rule, IsotropicRule):
+        return _isotropic_row, rule.table
+    if isinstance(rule, GenerationsRule):
+        return _generations_row, rule.table
+    if isinstance(rule, TotalisticRule):
+        return _totalistic_row, rule.table
+
+    return _function_row, rule
+
+
+# Row functions share their signature
+# pylint: disable=unused-argument
+
+def _isotropic_row(out: List[int], sums: List[int], row: List[int],
+                   alive: List[int], table: Any) -> None:
+    """Look up the 3x3 neighborhood of every cell in an isotropic rule table."""
+    for x in range(len(sums) - 2):
+        out[x] = table[sums[x] | sums[x + 1] << 1 | sums[x + 2] << 2]
+
+
+def _generations_row(out: List[int], sums: List[int], row: List[int],
+                     alive: List[int], table: Any) -> None:
+    """Look up the state and neighbor count of every cell in a Generations table."""
+    for x, state in enumerate(row):
+        alive_count = sums[x] + sums[x + 1] + sums[x + 2] - alive[x]
+        out[x] = table[state][alive_count]
+
+
+def _totalistic_row(out: List[int], sums: List[int], row: List[int],
+                    alive: List[int], table: Any) -> None:
+    """Look up the neighbor count of every cell in a birth/survival table."""
+    births, survivals = table
+    for x, cell in enumerate(row):
+        alive_count = sums[x] + sums[x + 1] + sums[x + 2] - cell
+        out[x] = survivals[alive_count] if cell else births[alive_count]
+
+
+def _function_row(out: List[int], sums: List[int], row: List[int],
+                  alive: List[int], table: Any) -> None:
+    """Call a rule function for every cell."""
+    for x, cell in enumerate(row):
+        alive_count = sums[x] + sums[x + 1] + sums[x + 2] - cell
+        out[x] = table(cell, alive_count, ())
@@ -0,0 +1,119 @@
+"""Sparse simulation engine"""
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING, Any, FrozenSet, List, Set, Tuple
+
+from pygol.utils.matrix import NEIGHBORS
+
+from ..compile import transition_table
+from .base import Engine, Stats, Window
+
+if TYPE_CHECKING:
+    from pygol.game import Game
+
+Cell = Tuple[int, int]
+
+
+class SparseGrid(Window):
+    """Window of a ``SparseEngine`` universe.
+
+    Parameters
+    ----------
+    cells: `set` [`tuple` [int, int]]
+        Coordinates of all living cells of the universe.
+    origin: `tuple` [int, int]
+        Coordinates of the top left corner of the window in the universe.
+    width, height: int
+        Width and height of the window.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, cells: Set[Cell], origin: Tuple[int, int],
+                 width: int, height: int):
+        super().__init__(origin, width, height)
+        self.cells = cells
+
+    def paint(self, rows: List[List[int]]) -> None:
+        left, top = self.origin
+
+        for x, y in self.cells:
+            if 0 <= x - left < self.width and 0 <= y - top < self.height:
+                rows[y - top][x - left] = 1
+
+
+class SparseEngine(Engine):
+    """Sparse simulation engine.
+
+    Only the coordinates of living cells are stored, on an unbounded plane.
+    Memory use is proportional to the population instead of the area of the
+    grid, and patterns never hit an edge, so no padding is needed. The grid of
+    the ``Game`` is a window onto this plane, which can be moved using
+    ``Game.view``.
+
+    Notes
+    -----
+    ``Game.wrap`` is ignored by this engine. This engine only supports
+    totalistic rules that do not give birth to cells without any living
+    neighbors.
+
+    Statistics (see ``Engine.stats``) describe the whole universe, with the
+    bounding box given in universe coordinates.
+    """
+
+    def load(self, game: Game) -> SparseGrid:
+        if isinstance(game.matrix, SparseGrid):
+            return game.matrix
+
+        cells = {(x, y) for y, row in enumerate(game.matrix)
+                 for x, col in enumerate(row) if col}
+
+        return SparseGrid(cells, (0, 0), game.width, game.height)
+
+    def dump(self, game: Game) -> List[List[int]]:
+        return [list(row) for row in self.load(game)]
+
+    def fingerprint(self, game: Game) -> int:
+        return hash(self.snapshot(game))
+
+    def snapshot(self, game: Game) -> FrozenSet[Tuple[int, int]]:
+        return frozenset(self.load(game).cells)
+
+    def population(self, game: Game) -> int:
+        return len(self.load(game).cells)
+
+    def stats(self, game: Game, previous: Any = None) -> Stats:
+        cells = self.load(game).cells
+        births = deaths = bounds = None
+
+        if previous is not None:
+            before = previous.cells if isinstance(previous, SparseGrid) else {
+                (x, y) for y, row in enumerate(previous)
+                for x, col in enumerate(row) if col}
+            births, deaths = len(cells - before), len(before - cells)
+
+        if cells:
+            xs, ys = [x for x, _ in cells], [y for _, y in cells]
+            left, top = min(xs), min(ys)
+            bounds = (left, top, max(xs) - left + 1, max(ys) - top + 1)
+
+        return Stats(game.generation, len(cells), births, deaths, bounds)
+
+    def tick(self, game: Game) -> SparseGrid:
+        grid = self.load(game)
+        births, survivals = transition_table(game.rule)
+
+        if births[0]:
+            raise ValueError("The sparse engine does not support rules with B0")
+
+        live = grid.cells
+        counts = Counter((x + dir_x, y + dir_y)
+                         for x, y in live for dir_x, dir_y in NEIGHBORS)
+
+        cells = {cell for cell, live_count in counts.items()
+                 if (survivals if cell in live else births)[live_count]}
+
+        if survivals[0]:
+            cells.update(cell for cell in live if cell not in counts)
+
+        return SparseGrid(cells, grid.origin, game.width, game.height)
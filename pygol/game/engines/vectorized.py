@@ -0,0 +1,355 @@
+"""NumPy simulation engine"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple
+
+from pygol.utils.matrix import NEIGHBORS
+
+from ..compile import (GenerationsRule, IsotropicRule, LargerThanLifeRule,
+                       transition_table)
+from ..rules import Signature
+from .base import Engine, Stats, Tally
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+if TYPE_CHECKING:
+    from pygol.game import Game
+
+
+class NumpyEngine(Engine):
+    """Vectorized NumPy simulation engine.
+
+    The grid is stored as a ``uint8`` NumPy array. Neighbor counts are computed
+    for the whole grid at once by summing shifted views of the grid, and the
+    next generation is looked up in the birth/survival table of the rule.
+
+    Multi-state Generations rules (see ``compile.GenerationsRule``) are
+    supported as well. Their states are stored in the same ``uint8`` grid, and
+    only fully alive cells are counted as neighbors. Isotropic non-totalistic
+    rules (see ``compile.IsotropicRule``) are looked up by the 3x3 neighborhood
+    of every cell instead of its neighbor count. Larger than Life rules (see
+    ``compile.LargerThanLifeRule``) count neighbors using prefix sums, so the
+    cost per cell does not grow with the area of the neighborhood.
+
+    Notes
+    -----
+    This engine only supports compiled rules and the rules in
+    ``game.rules.RULES``, i.e. rules that do not depend on the position of a
+    cell. Other rule functions require the ``python`` engine.
+
+    Raises
+    ------
+    ImportError
+        If NumPy is not installed.
+    """
+
+    def __init__(self):
+        if np is None:
+            raise ImportError("The numpy engine requires NumPy to be installed")
+
+    def load(self, game: Game) -> np.ndarray:
+        if isinstance(game.matrix, np.ndarray):
+            return game.matrix
+
+        return np.array(game.matrix, dtype=np.uint8).reshape(
+            game.height, game.width)
+
+    def dump(self, game: Game) -> List[List[int]]:
+        return self.load(game).tolist()
+
+    def fingerprint(self, game: Game) -> int:
+        return hash(self.load(game).tobytes())
+
+    def snapshot(self, game: Game) -> Tuple[Tuple[int, ...], bytes]:
+        grid = self.load(game)
+        return grid.shape, grid.tobytes()
+
+    def population(self, game: Game) -> int:
+        return int(np.count_nonzero(self.load(game) == 1))
+
+    def stats(self, game: Game, previous: Any = None) -> Stats:
+        return census(self.load(game), previous, game.generation)
+
+    def tick(self, game: Game) -> np.ndarray:
+        grid = self.load(game)
+        result = step(grid, game.rule, game.wrap)
+        self.tally = Tally(result, *census(result, grid, game.generation + 1)[1:])
+        return result
+
+
+def step(grid: np.ndarray, rule: Signature, wrap: bool) -> np.ndarray:
+    """Compute the next generation of a grid.
+
+    Parameters
+    ----------
+    grid: numpy.ndarray
+        ``uint8`` grid holding the state of every cell.
+    rule: `callable` [[int, int, Neighbors], int]
+        Totalistic rule or compiled rule (see ``compile.compile_rule``) to
+        apply.
+    wrap: bool
+        Whether to wrap the grid around the edges.
+
+    Returns
+    -------
+    numpy.ndarray
+        Next generation of the grid.
+    """
+    mode = "wrap" if wrap else "constant"
+
+    if isinstance(rule, LargerThanLifeRule):
+        return larger_than_life(grid, rule, mode)
+
+    if isinstance(rule, GenerationsRule):
+        # Dying cells are not counted as living neighbors
+        table = np.array(rule.table, dtype=np.uint8)
+        alive = np.pad((grid == 1).view(np.uint8), 1, mode=mode)
+        return table[grid, neighbor_counts(alive)]
+
+    padded = np.pad(grid, 1, mode=mode)
+
+    if isinstance(rule, IsotropicRule):
+        table = np.array(rule.table, dtype=np.uint8)
+        return table[neighborhood_index(padded)]
+
+    table = np.array(transition_table(rule), dtype=np.uint8)
+    return next_generation(padded, table)
+
+
+def census(grid: np.ndarray, previous: Any, generation: int) -> Stats:
+    """Compute statistics of a generation, see ``Engine.stats``.
+
+    Parameters
+    ----------
+    grid: numpy.ndarray
+        ``uint8`` grid of the generation.
+    previous: `Any`
+        Grid of the previous generation, or ``None`` if it is not known.
+    generation: int
+        Number of the generation.
+
+    Returns
+    -------
+    Stats
+        Statistics of the generation.
+    """
+    alive = grid == 1
+    births = deaths = None
+
+    if previous is not None:
+        changed = alive != (np.asarray(previous) == 1)
+        births = int(np.count_nonzero(changed & alive))
+        deaths = int(np.count_nonzero(changed)) - births
+
+    return Stats(generation, int(np.count_nonzero(alive)), births, deaths,
+                 bounding_box(alive.any(axis=1), alive.any(axis=0)))
+
+
+def bounding_box(rows: np.ndarray,
+                 cols: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
+    """Find the bounding box of the living cells of a grid.
+
+    Parameters
+    ----------
+    rows, cols: numpy.ndarray
+        Boolean arrays telling which rows and columns contain living cells.
+
+    Returns
+    -------
+    `optional` [`tuple` [int, int, int, int]]
+        ``(x, y, width, height)`` of the bounding box, or ``None`` if there
+        are no living cells.
+    """
+    rows, cols = np.flatnonzero(rows), np.flatnonzero(cols)
+    if not len(rows):
+        return None
+
+    return (int(cols[0]), int(rows[0]), int(cols[-1] - cols[0] + 1),
+            int(rows[-1] - rows[0] + 1))
+
+
+def next_generation(padded: np.ndarray, table: np.ndarray) -> np.ndarray:
+    """Compute the next generation of a grid surrounded by a border of cells.
+
+    Parameters
+    ----------
+    padded: numpy.ndarray
+        ``uint8`` grid with a border of one cell on every side. The border
+        holds the cells beyond the edges of the grid, e.g. the opposite edges
+        of the grid when wrapping.
+    table: numpy.ndarray
+        ``uint8`` transition table of shape ``(2, 9)``, as returned by
+        ``compile.transition_table``.
+
+    Returns
+    -------
+    numpy.ndarray
+        Next generation of the grid without its border.
+    """
+    return table[padded[..., 1:-1, 1:-1], neighbor_counts(padded)]
+
+
+def neighbor_counts(padded: np.ndarray) -> np.ndarray:
+    """Count the living neighbors of every cell of a grid.
+
+    Parameters
+    ----------
+    padded: numpy.ndarray
+        ``uint8`` grid with a border of one cell on every side. Leading axes
+        are treated as a batch of independent grids.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``uint8`` count of living neighbors of every cell without the border.
+    """
+    height, width = padded.shape[-2] - 2, padded.shape[-1] - 2
+
+    counts = np.zeros_like(padded[..., 1:-1, 1:-1])
+    for dir_x, dir_y in NEIGHBORS:
+        counts += padded[..., 1 + dir_y:1 + dir_y + height,
+                         1 + dir_x:1 + dir_x + width]
+
+    return counts
+
+
+def neighborhood_index(padded: np.ndarray) -> np.ndarray:
+    """Encode the 3x3 neighborhood of every cell of a grid.
+
+    Parameters
+    ----------
+    padded: numpy.ndarray
+        ``uint8`` grid of ``0`` and ``1`` cells with a border of one cell on
+        every side. Leading axes are treated as a batch of independent grids.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``uint16`` index of every cell without the border, as used by
+        ``compile.IsotropicRule.table``. Bit ``3 * (dy + 1) + dx + 1`` holds the
+        cell at offset ``(dx, dy)``.
+    """
+    height, width = padded.shape[-2] - 2, padded.shape[-1] - 2
+
+    index = np.zeros(padded[..., 1:-1, 1:-1].shape, dtype=np.uint16)
+    for dir_y in range(3):
+        for dir_x in range(3):
+            shifted = padded[..., dir_y:dir_y + height, dir_x:dir_x + width]
+            index |= shifted.astype(np.uint16) << np.uint16(3 * dir_y + dir_x)
+
+    return index
+
+
+def larger_than_life(grid: np.ndarray, rule: LargerThanLifeRule,
+                     mode: str) -> np.ndarray:
+    """Compute the next generation of a grid using a Larger than Life rule.
+
+    Parameters
+    ----------
+    grid: numpy.ndarray
+        ``uint8`` grid holding the state of every cell.
+    rule: LargerThanLifeRule
+        Rule to apply.
+    mode: str
+        ``numpy.pad`` mode used for the cells beyond the edges of the grid,
+        ``wrap`` or ``constant``.
+
+    Returns
+    -------
+    numpy.ndarray
+        Next generation of the grid.
+    """
+    radius = rule.radius
+    # Dying cells are not counted as living neighbors
+    alive = (grid == 1).view(np.uint8)
+    padded = np.pad(alive, radius, mode=mode)
+
+    if rule.neighborhood == "M":
+        counts = box_counts(padded, radius)
+        if not rule.middle:
+            counts -= alive
+    else:
+        counts = run_counts(padded, rule.offsets, radius)
+
+    births, survivals = (np.array(counts, dtype=bool) for counts in rule.table)
+    decayed = np.where(grid > 0, (grid + 1) % rule.states, births[counts])
+
+    return np.where((grid == 1) & survivals[counts], 1, decayed).astype(np.uint8)
+
+
+def box_counts(padded: np.ndarray, radius: int) -> np.ndarray:
+    """Count the living cells in a square around every cell of a grid.
+
+    The counts are read from a summed-area table of the grid, taking four
+    lookups per cell regardless of the radius.
+
+    Parameters
+    ----------
+    padded: numpy.ndarray
+        ``uint8`` grid of ``0`` and ``1`` cells with a border of ``radius``
+        cells on every side.
+    radius: int
+        Range of the square. Each square holds ``(2 * radius + 1) ** 2``
+        cells, including the cell in its centre.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``int32`` count of every cell without the border.
+    """
+    size = 2 * radius + 1
+    table = np.pad(padded.cumsum(0, dtype=np.int32).cumsum(1), ((1, 0), (1, 0)))
+
+    return (table[size:, size:] - table[:-size, size:] - table[size:, :-size]
+            + table[:-size, :-size])
+
+
+def run_counts(padded: np.ndarray, offsets, radius: int) -> np.ndarray:
+    """Count the living cells in any neighborhood of every cell of a grid.
+
+    The neighborhood is split into horizontal runs of cells, and the cells of
+    every run are counted using prefix sums of the rows of the grid, taking two
+    lookups per run and cell.
+
+    Parameters
+    ----------
+    padded: numpy.ndarray
+        ``uint8`` grid of ``0`` and ``1`` cells with a border of ``radius``
+        cells on every side.
+    offsets: `iterable` [`tuple` [int, int]]
+        Offsets ``(dx, dy)`` of the cells of the neighborhood, within
+        ``radius`` cells of the centre.
+    radius: int
+        Range of the neighborhood.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``int32`` count of every cell without the border.
+    """
+    height, width = padded.shape[0] - 2 * radius, padded.shape[1] - 2 * radius
+    prefix = np.pad(padded.cumsum(1, dtype=np.int32), ((0, 0), (1, 0)))
+
+    counts = np.zeros((height, width), dtype=np.int32)
+    for dir_y, low, high in _runs(offsets):
+        rows = prefix[radius + dir_y:radius + dir_y + height]
+        counts += (rows[:, radius + high + 1:radius + high + 1 + width]
+                   - rows[:, radius + low:radius + low + width])
+
+    return counts
+
+
+def _runs(offsets):
+    """Split offsets into runs ``(dy, low, high)`` of adjacent columns."""
+    runs = []
+
+    for dir_x, dir_y in sorted(offsets, key=lambda offset: offset[::-1]):
+        if runs and runs[-1][0] == dir_y and runs[-1][2] == dir_x - 1:
+            runs[-1][2] = dir_x
+        else:
+            runs.append([dir_y, dir_x, dir_x])
+
+    return runs
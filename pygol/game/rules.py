@@ -1,6 +1,10 @@
 """Common Game of Life Rules"""
+from __future__ import annotations
+
 # pylint: disable=unused-argument
-from typing import Callable, Iterator, Tuple
+from typing import Callable, Iterator, Optional, Tuple, Union
+
+from .compile import TotalisticRule, compile_rule
 
 Neighbors = Iterator[Tuple[int, int, int]]
 Signature = Callable[[int, int, Neighbors], int]
@@ -677,3 +681,63 @@ RULES = {
     "23/38": pedestrian_life,
     "pedestrian life": pedestrian_life
 }
+
+#: Set of all rule functions in ``RULES``
+BUILTIN = frozenset(RULES.values())
+
+
+def rule_string(rule: Signature) -> Optional[str]:
+    """Get the rule string of a rule.
+
+    Parameters
+    ----------
+    rule: `callable` [[int, int, Neighbors], int]
+        Rule to describe.
+
+    Returns
+    -------
+    `optional` [str]
+        Rule string compiling to the rule, or ``None`` for rule functions that
+        cannot be described by a rule string.
+
+    Examples
+    --------
+    >>> rule_string(resolve("conway"))
+    'B3/S23'
+
+    """
+    try:
+        return str(rule) if compile_rule(str(rule)) == rule else None
+    except ValueError:
+        return None
+
+
+def resolve(rule: Union[Signature, str]) -> Signature:
+    """Get the rule of a rule string.
+
+    Parameters
+    ----------
+    rule: `union` [`Rule Func`, str]
+        Rule string or function. Rule strings are looked up in ``RULES`` first
+        and compiled otherwise, so any ``B/S`` or ``S/B`` rule string is
+        supported, as well as Generations, Hensel and Larger than Life rule
+        strings. The rule functions in ``RULES`` are compiled as well. Other
+        functions are returned as is and applied cell by cell.
+
+    Returns
+    -------
+    `callable` [[int, int, Neighbors], int]
+        Compiled rule or rule function.
+
+    Raises
+    ------
+    ValueError
+        If the rule string is neither in ``RULES`` nor a valid rule string.
+    """
+    if isinstance(rule, str):
+        rule = RULES.get(rule) or RULES.get(rule.upper()) or compile_rule(rule)
+
+    if rule in BUILTIN:
+        return TotalisticRule.tabulate(rule)
+
+    return rule
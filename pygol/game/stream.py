@@ -0,0 +1,251 @@
+"""PyGoL lazy streams of generations"""
+from __future__ import annotations
+
+from collections import deque
+from itertools import islice
+from typing import (TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator,
+                    List, NamedTuple)
+
+if TYPE_CHECKING:
+    from pygol.game import Game
+
+
+class Generation:
+    """Lightweight view of the current generation of a game.
+
+    Views do not copy the grid of the game. They stay valid until the game
+    advances, after which accessing their cells raises a ``ValueError``. Use
+    ``tolist()`` to keep a copy of the cells around.
+
+    Parameters
+    ----------
+    game: Game
+        Game to view.
+
+    Attributes
+    ----------
+    game: Game
+        Viewed game.
+    generation: int
+        Generation of the game when the view was created.
+    """
+
+    __slots__ = ("game", "generation", "_population")
+
+    def __init__(self, game: Game):
+        self.game = game
+        self.generation = game.generation
+        self._population = None
+
+    def __repr__(self) -> str:
+        return f"Generation({self.generation})"
+
+    @property
+    def stale(self) -> bool:
+        """Whether the game has advanced since the view was created."""
+        return self.game.generation != self.generation
+
+    @property
+    def grid(self) -> Any:
+        """Native grid of the engine of the game, without copying it."""
+        self._check()
+        return self.game.matrix
+
+    @property
+    def population(self) -> int:
+        """Amount of living cells, see ``Engine.population``."""
+        if self._population is None:
+            self._check()
+            self._population = self.game.engine.population(self.game)
+
+        return self._population
+
+    @property
+    def fingerprint(self) -> int:
+        """Fingerprint of the cells, see ``Engine.fingerprint``."""
+        self._check()
+        return self.game.engine.fingerprint(self.game)
+
+    def tolist(self) -> List[List[int]]:
+        """Copy the cells of the generation.
+
+        Returns
+        -------
+        `list` [`list` [int]]
+            Cells of the generation as a list of rows.
+        """
+        self._check()
+        return self.game.tolist()
+
+    def _check(self) -> None:
+        """Make sure the game did not advance since the view was created."""
+        if self.stale:
+            raise ValueError(f"Generation {self.generation} is no longer "
+                             f"available, the game is at generation "
+                             f"{self.game.generation}")
+
+
+class Summary(NamedTuple):
+    """Statistics over a sliding window of generations.
+
+    Attributes
+    ----------
+    generation: int
+        Last generation of the window.
+    mean, minimum, maximum: float
+        Mean, minimum and maximum of the measured values in the window.
+    """
+    generation: int
+    mean: float
+    minimum: float
+    maximum: float
+
+
+def every(stream: Iterable[Generation], n: int) -> Iterator[Generation]:
+    """Keep every ``n``-th generation of a stream.
+
+    Skipped generations are still computed. To skip their computation, pass
+    ``step`` to ``Game.generations()`` instead.
+
+    Parameters
+    ----------
+    stream: `iterable` [Generation]
+        Stream of generations.
+    n: int
+        Amount of generations between kept generations, starting with the
+        first generation of the stream.
+
+    Returns
+    -------
+    `iterator` [Generation]
+        Every ``n``-th generation of the stream.
+    """
+    return islice(stream, 0, None, n)
+
+
+def until_stable(stream: Iterable[Generation],
+                 history: int = 1000) -> Iterator[Generation]:
+    """Stop a stream once it repeats itself.
+
+    Fingerprints of recent generations are compared to the fingerprint of
+    every new generation, like ``Game.detect()`` does.
+
+    Parameters
+    ----------
+    stream: `iterable` [Generation]
+        Stream of generations.
+    history: int, optional
+        Amount of recent fingerprints kept. Only cycles shorter than
+        ``history`` generations are detected. Defaults to ``1000``.
+
+    Returns
+    -------
+    `iterator` [Generation]
+        Generations of the stream, up to and including the first generation
+        repeating an earlier one.
+    """
+    seen: Dict[int, int] = {}
+
+    for view in stream:
+        yield view
+
+        key = view.fingerprint
+        if key in seen:
+            return
+
+        seen[key] = view.generation
+        if len(seen) > history:
+            del seen[next(iter(seen))]
+
+
+def take_while_population(stream: Iterable[Generation],
+                          predicate: Callable[[int], bool]
+                          ) -> Iterator[Generation]:
+    """Stop a stream once its population no longer satisfies a predicate.
+
+    Parameters
+    ----------
+    stream: `iterable` [Generation]
+        Stream of generations.
+    predicate: `callable` [[int], bool]
+        Function receiving the population of a generation.
+
+    Returns
+    -------
+    `iterator` [Generation]
+        Generations of the stream, up to the first generation whose population
+        does not satisfy ``predicate``.
+    """
+    for view in stream:
+        if not predicate(view.population):
+            return
+        yield view
+
+
+def windows(stream: Iterable[Generation], size: int,
+            key: Callable[[Generation], float] = None) -> Iterator[Summary]:
+    """Compute statistics over a sliding window of generations.
+
+    The mean is kept as a running sum and the minimum and maximum as monotonic
+    queues, so every generation is processed in constant amortized time and
+    only ``size`` values are kept in memory.
+
+    Parameters
+    ----------
+    stream: `iterable` [Generation]
+        Stream of generations.
+    size: int
+        Amount of generations in a window.
+    key: `callable` [[Generation], float], optional
+        Value measured for every generation. Defaults to the population.
+
+    Returns
+    -------
+    `iterator` [Summary]
+        Statistics of every full window, starting once ``size`` generations
+        have been seen.
+
+    Raises
+    ------
+    ValueError
+        If ``size`` is smaller than ``1``.
+
+    Examples
+    --------
+    Mean population over the last 100 generations
+
+    >>> for window in windows(conw.generations(10_000), 100):
+    ...     print(window.generation, window.mean)
+
+    """
+    if size < 1:
+        raise ValueError("Windows must hold at least one generation")
+
+    key = key or (lambda view: view.population)
+    values: deque = deque()
+    lows: deque = deque()
+    highs: deque = deque()
+    total = 0
+
+    for index, view in enumerate(stream):
+        value = key(view)
+        values.append(value)
+        total += value
+
+        while lows and lows[-1][1] > value:
+            lows.pop()
+        while highs and highs[-1][1] < value:
+            highs.pop()
+        lows.append((index, value))
+        highs.append((index, value))
+
+        if len(values) > size:
+            total -= values.popleft()
+        if lows[0][0] <= index - size:
+            lows.popleft()
+        if highs[0][0] <= index - size:
+            highs.popleft()
+
+        if len(values) == size:
+            yield Summary(view.generation, total / size, lows[0][1],
+                          highs[0][1])
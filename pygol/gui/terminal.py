@@ -1,6 +1,7 @@
 """Terminal display"""
 import os
 import signal
+import sys
 import time
 from multiprocessing.connection import Connection
 
@@ -27,6 +28,8 @@ def display(conn: Connection) -> None:
     ``SIGTERM``
     """
     delay = conn.recv()
+    # Frames are rendered into the same buffer, see ``Matrix.render_into``
+    frame = bytearray()
 
     while True:
         os.system("clear")
@@ -35,5 +38,7 @@ def display(conn: Connection) -> None:
         if world == signal.SIGTERM:
             return signal.SIGTERM
 
-        print(world)
+        size = world.render_into(frame)
+        sys.stdout.buffer.write(memoryview(frame)[:size])
+        sys.stdout.flush()
         time.sleep(delay)
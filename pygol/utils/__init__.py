@@ -1,3 +1,4 @@
 """PyGoL utilities"""
-from .matrix import Matrix
+from .matrix import Grid, Matrix
 from .parse_rle import parse as parse_rle
+from .render import TextRenderer
@@ -1,14 +1,251 @@
 """Matrix utility"""
+import functools
 import itertools
 import math
 import random
-from typing import Any, List
+from array import array
+from typing import Any, Iterator, List, Tuple, Union
+
+from .render import TextRenderer
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
 
 DX = [0, +1, 0, -1]
 DY = [-1, 0, +1, 0]
 
 # remove (0, 0) as this is the point we're looking at
-NEIGHBORS = set(itertools.product(DX, repeat=2)) - {(0, 0)}
+NEIGHBORS = tuple(sorted(set(itertools.product(DX, repeat=2)) - {(0, 0)},
+                         key=lambda offset: (offset[1], offset[0])))
+
+#: Translation table mapping living cells to ``1`` and other states to ``0``
+ALIVE = bytes(int(state == 1) for state in range(256))
+
+#: States rendered by ``DIGITS``
+DIGIT_STATES = bytes(range(10))
+#: Renderers of matrices holding single-digit cells and any other cells
+DIGITS = TextRenderer([f"{state} " for state in range(10)])
+NUMBERS = TextRenderer([f"{state} " for state in range(256)])
+
+#: Symmetries of random fills, see ``Matrix.fill_random``
+SYMMETRIES = ("C1", "C2", "C4", "D8")
+
+
+class Grid:
+    """Contiguous grid of ``uint8`` cells.
+
+    All cells are stored row by row in a single ``bytearray``, using one byte
+    per cell. The grid supports ``grid[row][col]`` access and iteration over
+    its rows just like a list of lists. Rows are ``memoryview`` objects onto
+    the cells, so reading and writing them never copies any cells.
+
+    The cells are exposed through the buffer protocol: NumPy, pygame and files
+    can read and write ``cells`` without copying them, e.g. using
+    ``np.frombuffer(grid.cells)`` or ``file.readinto(grid.cells)``.
+    ``np.asarray(grid)`` is a ``(height, width)`` view onto the cells, and on
+    Python 3.12 and later ``memoryview(grid)`` is a two-dimensional view.
+
+    Parameters
+    ----------
+    width, height: int
+        Width and height of the grid.
+    cells: `bytes-like`, optional
+        Cells of the grid, row by row. The cells are copied. If not specified,
+        all cells are ``0``.
+
+    Attributes
+    ----------
+    width: int
+        Width of the grid.
+    height: int
+        Height of the grid.
+    cells: bytearray
+        Cells of the grid, row by row.
+    """
+
+    __slots__ = ("width", "height", "cells", "_rows")
+
+    def __init__(self, width: int, height: int, cells: Any = None):
+        self.width = width
+        self.height = height
+        self.cells = bytearray(width * height if cells is None else cells)
+        self._rows = None
+
+    @classmethod
+    def pack(cls, cells: Any) -> "Grid":
+        """Copy a grid of cells into a new ``Grid``.
+
+        Parameters
+        ----------
+        cells: `Any`
+            Grid to copy, e.g. a list of lists, a NumPy array or a ``Grid``.
+            Cells must be integers from ``0`` to ``255``.
+
+        Returns
+        -------
+        Grid
+            Copy of the cells.
+        """
+        if isinstance(cells, Grid):
+            return cls(cells.width, cells.height, cells.cells)
+
+        if np is not None and hasattr(cells, "__array__"):
+            packed = np.ascontiguousarray(cells, dtype=np.uint8)
+            return cls(packed.shape[1], packed.shape[0], packed)
+
+        rows = [bytes(row) for row in cells]
+        return cls(len(rows[0]) if rows else 0, len(rows), b"".join(rows))
+
+    def __reduce__(self):
+        # Row views cannot be pickled
+        return type(self), (self.width, self.height, bytes(self.cells))
+
+    def __repr__(self) -> str:
+        return f"Grid({self.width}, {self.height})"
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Grid):
+            return NotImplemented
+
+        return (self.width, self.height) == (other.width, other.height) \
+            and self.cells == other.cells
+
+    __hash__ = None
+
+    def __buffer__(self, _flags: int) -> memoryview:
+        if not self.cells:
+            return memoryview(self.cells)
+
+        return memoryview(self.cells).cast("B", (self.height, self.width))
+
+    def __array__(self, dtype=None, copy=None) -> "np.ndarray":
+        cells = np.frombuffer(self.cells, dtype=np.uint8)
+        cells = cells.reshape(self.height, self.width)
+        if dtype is not None:
+            return cells.astype(dtype)
+
+        return cells.copy() if copy else cells
+
+    @property
+    def rows(self) -> List[memoryview]:
+        """`list` [memoryview]: Views onto the rows of the grid."""
+        if self._rows is None:
+            cells, width = memoryview(self.cells), self.width
+            self._rows = [cells[y * width:(y + 1) * width]
+                          for y in range(self.height)]
+
+        return self._rows
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __iter__(self) -> Iterator[memoryview]:
+        return iter(self.rows)
+
+    def __getitem__(self, row: Union[int, slice]) -> Any:
+        return self.rows[row]
+
+    def __setitem__(self, row: int, cells: Any):
+        self.rows[row][:] = bytes(cells)
+
+    def tolist(self) -> List[List[int]]:
+        """Copy the cells into a list of lists.
+
+        Returns
+        -------
+        `list` [`list` [int]]
+            Cells of the grid.
+        """
+        return [row.tolist() for row in self.rows]
+
+    # pylint: disable=too-many-arguments
+    def padded(self, top: int, right: int, bottom: int, left: int,
+               value: int = 0) -> "Grid":
+        """Copy the grid with rows and columns added or removed at its edges.
+
+        Parameters
+        ----------
+        top, right, bottom, left: int
+            Amount of rows or columns to add at each edge. Negative amounts
+            remove rows or columns instead.
+        value: int, optional
+            Value of added cells. Defaults to ``0``.
+
+        Returns
+        -------
+        Grid
+            New grid of size ``(width + left + right, height + top + bottom)``.
+        """
+        return reframe(self, top, right, bottom, left, value)
+
+    def fill_run(self, row: int, start: int, stop: int, state: int) -> None:
+        """Set a run of cells of a row to the same state.
+
+        Parameters
+        ----------
+        row: int
+            Row of the run.
+        start, stop: int
+            First column of the run and column after its last cell.
+        state: int
+            State of the cells.
+        """
+        offset = row * self.width
+        self.cells[offset + start:offset + stop] = bytes((state,)) * (stop - start)
+
+
+# pylint: disable=too-many-arguments
+def reframe(cells: Any, top: int, right: int, bottom: int, left: int,
+            value: int = 0) -> Grid:
+    """Copy a grid, adding or removing rows and columns at its edges.
+
+    The new grid is allocated once, and the kept cells are copied into it in
+    a single pass: a single vectorized copy if NumPy is installed, or one
+    slice assignment per row otherwise. Padding, cropping and resizing thus
+    cost one copy of the resulting grid, no matter how much is added.
+
+    Parameters
+    ----------
+    cells: `Any`
+        Grid to copy, e.g. a ``Grid`` or a two-dimensional ``uint8`` NumPy
+        array.
+    top, right, bottom, left: int
+        Amount of rows or columns to add at each edge. Negative amounts remove
+        rows or columns instead.
+    value: int, optional
+        Value of added cells. Defaults to ``0``.
+
+    Returns
+    -------
+    Grid
+        New grid holding the kept cells.
+    """
+    height = len(cells)
+    width = len(cells[0]) if height else 0
+
+    grid = Grid(max(width + left + right, 0), max(height + top + bottom, 0))
+    if value:
+        grid.cells[:] = bytes([value]) * len(grid.cells)
+
+    # Rows and columns of the old grid kept in the new grid
+    rows = range(max(-top, 0), min(height, height + bottom))
+    start, stop = max(-left, 0), min(width, width + right)
+    if not rows or stop <= start:
+        return grid
+
+    if np is not None:
+        np.asarray(grid)[rows.start + top:rows.stop + top,
+                         start + left:stop + left] = \
+            np.asarray(cells)[rows.start:rows.stop, start:stop]
+        return grid
+
+    for y in rows:
+        row = bytes(cells[y][start:stop])
+        grid.rows[y + top][start + left:stop + left] = row
+
+    return grid
 
 
 class Matrix:
@@ -16,7 +253,8 @@ class Matrix:
 
     This matrix class is iterable (yielding elements from left to right, top to
     bottom) and supports prettyprinting (via the __str__ method) as well as
-    square bracket access (`matrix[row][col]`).
+    square bracket access (`matrix[row][col]`). Cells are integers from ``0``
+    to ``255``, stored in a contiguous ``Grid`` using one byte per cell.
 
     Parameters
     ----------
@@ -25,10 +263,12 @@ class Matrix:
     height: int, optional
         Height of the resulting matrix. If no height is specified, ``height``
         will default to ``width``, resulting in a square matrix.
-    content: `list` [`list` [`Any`]], optional
+    content: `list` [`list` [int]], optional
         Optional content to fill the matrix with. This content must be of the
-        same dimensions as the desired matrix. If not specified, the matrix
-        will be filled with ``0``.
+        same dimensions as the desired matrix. Lists of lists are copied into
+        a ``Grid``, while grids, NumPy arrays and other objects supporting
+        ``__array__`` are used as is. If not specified, the matrix will be
+        filled with ``0``.
 
     Attributes
     ----------
@@ -36,7 +276,7 @@ class Matrix:
         Width of the matrix.
     height: int
         Height of the matrix.
-    matrix: `list` [`list` [`Any`]]
+    matrix: Grid
         Content of the matrix.
 
     Examples
@@ -64,6 +304,8 @@ class Matrix:
 
     """
 
+    __slots__ = ("width", "height", "matrix")
+
     def __init__(self, width: int, height: int = None,
                  content: List[List[Any]] = None):
         if not height:
@@ -72,25 +314,66 @@ class Matrix:
         self.height = height
         self.width = width
 
-        self.matrix = content or [
-            [0 for x in range(width)] for y in range(height)]
+        if content is None or not len(content):
+            content = Grid(width, height)
+        elif not hasattr(content, "__array__"):
+            content = Grid.pack(content)
+
+        self.matrix = content
 
     def __iter__(self):
         yield from self.matrix
 
     def __str__(self):
-        res = ""
+        cells = self._bytes()
+        return self._renderer(cells).render(cells, self.width, self.height)
+
+    def render_into(self, out: bytearray, offset: int = 0) -> int:
+        """Write the text of the matrix into a buffer.
 
-        for row in self.matrix:
-            for col in row:
-                res += str(col) + " "
-            res += "\n"
+        Like ``str(matrix)``, but the UTF-8 encoded text is written straight
+        into a buffer, which can be reused for every frame of a display.
 
-        return res
+        Parameters
+        ----------
+        out: bytearray
+            Buffer receiving the text. It is grown if it is too small.
+        offset: int, optional
+            Position in ``out`` to write the text to. Defaults to ``0``.
+
+        Returns
+        -------
+        int
+            Amount of bytes written.
+        """
+        cells = self._bytes()
+        return self._renderer(cells).render_into(cells, self.width,
+                                                 self.height, out, offset)
+
+    def _renderer(self, cells: bytes) -> TextRenderer:
+        """Get the renderer used to display the cells as text."""
+        return NUMBERS if cells.translate(None, DIGIT_STATES) else DIGITS
 
     def __getitem__(self, key):
         return self.matrix[key]
 
+    def tolist(self) -> List[List[Any]]:
+        """Return the content of the matrix as a list of lists.
+
+        Returns
+        -------
+        `list` [`list` [`Any`]]
+            Copy of the content of the matrix.
+        """
+        return self.matrix.tolist()
+
+    def _pad(self, top: int, right: int, bottom: int, left: int,
+             value: Any) -> None:
+        """Add or remove rows and columns at the edges of the matrix."""
+        self.matrix = reframe(self._cells(), top, right, bottom, left, value)
+        self.width = self.matrix.width
+        self.height = self.matrix.height
+
     def neighbors(self, x, y, wrap=False):
         """Iterate through the neighboors of a point.
 
@@ -116,21 +399,115 @@ class Matrix:
         See Wikipedia for more information:
         https://en.wikipedia.org/wiki/Moore_neighborhood
         """
+        columns = _near(self.width, wrap)[x]
+        rows = _near(self.height, wrap)[y]
+
         for dir_x, dir_y in NEIGHBORS:
-            new_x = (x + dir_x)
-            new_y = (y + dir_y)
+            new_x, inside_x = columns[dir_x + 1]
+            new_y, inside_y = rows[dir_y + 1]
 
-            # drop entries outside of matrix when no wrapping
-            if not wrap and not (0 <= new_x < self.width and 0 <= new_y < self.height):
-                # continue
+            # yield 0 for entries outside of matrix when no wrapping
+            if inside_x and inside_y:
+                yield self.matrix[new_y][new_x], new_x, new_y
+            else:
                 yield 0, new_x, new_y
-                continue
 
+    def neighbor_table(self, wrap: bool = False) -> array:
+        """Get the neighbor index table of the matrix.
+
+        Parameters
+        ----------
+        wrap: bool, optional
+            Whether to wrap around the edge of the matrix. Defaults to
+            ``False``.
+
+        Returns
+        -------
+        array
+            Flat indices of the neighbors of every cell, see
+            ``neighbor_table``.
+        """
+        return neighbor_table(self.width, self.height, wrap)
+
+    def neighbor_counts(self, wrap: bool = False) -> "Grid":
+        """Count the living neighbors of every cell at once.
+
+        Every row is turned into a big integer holding one byte per cell, so
+        that whole rows are summed at once: the rows above and below are
+        added, and the sums are shifted by one byte to the left and right.
+        Counts never exceed ``8``, so the bytes never carry into each other.
+
+        Parameters
+        ----------
+        wrap: bool, optional
+            Whether to wrap around the edge of the matrix. If wrap is
+            ``False`` cells outside of the matrix are dead; defaults to
+            ``False``.
+
+        Returns
+        -------
+        Grid
+            Amount of living (state ``1``) neighbors of every cell, using the
+            Moore neighborhood like ``neighbors()``.
+
+        Examples
+        --------
+        >>> matrix = Matrix(3, 3, [[0, 1, 0], [0, 1, 0], [0, 1, 0]])
+        >>> print(Matrix(3, 3, matrix.neighbor_counts()))
+        2 1 2
+        3 2 3
+        2 1 2
+
+        """
+        width, height = self.width, self.height
+        counts = Grid(width, height)
+        if not width or not height:
+            return counts
+
+        rows = [int.from_bytes(bytes(row).translate(ALIVE), "big")
+                for row in self._cells()]
+        mask = (1 << 8 * width) - 1
+        shift = 8 * (width - 1)
+
+        for y, row in enumerate(rows):
+            if wrap:
+                above, below = rows[y - 1], rows[(y + 1) % height]
+            else:
+                above = rows[y - 1] if y > 0 else 0
+                below = rows[y + 1] if y + 1 < height else 0
+
+            column = above + row + below
+            left, right = column >> 8, column << 8 & mask
             if wrap:
-                new_x %= self.width
-                new_y %= self.height
+                left |= (column & 0xFF) << shift
+                right |= column >> shift
+
+            counts.rows[y][:] = (left + column + right - row).to_bytes(width, "big")
+
+        return counts
+
+    def _bytes(self) -> Union[bytes, bytearray]:
+        """Get the cells as contiguous bytes, row by row."""
+        grid = self.matrix
+        if isinstance(grid, Grid):
+            return grid.cells
+
+        if np is not None and hasattr(grid, "__array__"):
+            return np.asarray(grid, dtype=np.uint8).tobytes()
+
+        # Rows of ints are encoded straight from the grid, without copying it
+        return b"".join(map(bytes, grid))
 
-            yield self.matrix[new_y][new_x], new_x, new_y
+    def _cells(self) -> Any:
+        """Get the cells as a ``Grid`` or a ``uint8`` NumPy array."""
+        grid = self.matrix
+        if isinstance(grid, Grid):
+            return grid
+
+        if np is not None and hasattr(grid, "__array__"):
+            return np.asarray(grid, dtype=np.uint8)
+
+        return Grid.pack(grid)
 
     def pad_right(self, right: int, value: Any = 0):
         """Pad the right side of the matrix.
@@ -159,15 +536,7 @@ class Matrix:
         0 0 2
 
         """
-        self.width += right
-
-        for row in self.matrix:
-            for _ in range(abs(right)):
-                if right >= 0:
-                    row.append(value)
-                else:
-                    row.pop()
-
+        self._pad(0, right, 0, 0, value)
         return self
 
     def pad_left(self, left: int, value: Any = 0):
@@ -197,15 +566,7 @@ class Matrix:
         2 0 0
 
         """
-        self.width += left
-
-        for row in self.matrix:
-            for _ in range(abs(left)):
-                if left >= 0:
-                    row.insert(0, value)
-                else:
-                    row.pop(0)
-
+        self._pad(0, 0, 0, left, value)
         return self
 
     def pad_top(self, top: int, value: Any = 0):
@@ -236,15 +597,7 @@ class Matrix:
         0 0
 
         """
-        self.height += top
-
-        for _ in range(abs(top)):
-            if top >= 0:
-                self.matrix.insert(
-                    0, [value for x in range(self.width)])
-            else:
-                self.matrix.pop(0)
-
+        self._pad(top, 0, 0, 0, value)
         return self
 
     def pad_bottom(self, bottom: int, value: Any = 0):
@@ -275,14 +628,7 @@ class Matrix:
         2 2
 
         """
-        self.height += bottom
-
-        for _ in range(abs(bottom)):
-            if bottom >= 0:
-                self.matrix.append([value for x in range(self.width)])
-            else:
-                self.matrix.pop()
-
+        self._pad(0, 0, bottom, 0, value)
         return self
 
     # pylint: disable=too-many-arguments
@@ -311,6 +657,11 @@ class Matrix:
         self
             Returns the matrix object to allow chaining.
 
+        Notes
+        -----
+        Negative amounts remove rows or columns instead. All edges are padded
+        at once, copying the matrix a single time (see ``reframe``).
+
         Examples
         --------
         >>> matrix = Matrix(2)
@@ -332,10 +683,8 @@ class Matrix:
         if right is None:
             right = top
 
-        self.pad_top(top, value)
-        self.pad_bottom(bottom if (bottom is not None) else top, value)
-        self.pad_right(right, value)
-        self.pad_left(left if (left is not None) else right, value)
+        self._pad(top, right, bottom if (bottom is not None) else top,
+                  left if (left is not None) else right, value)
 
         return self
 
@@ -398,21 +747,57 @@ class Matrix:
 
         return self.pad(top, right, bottom, left, value)
 
-    def fill_random(self, minimum: int = 0, maximum: int = 1):
+    # pylint: disable=too-many-arguments
+    def fill_random(self, minimum: int = 0, maximum: int = 1,
+                    density: float = None, random_state: int = None,
+                    symmetry: str = None):
         """Fill the matrix with random values.
 
+        All cells are generated at once from an independent random generator:
+        every cell is drawn from one random byte, which is mapped to a value
+        using ``bytes.translate``. Filling a matrix of 16 million cells takes
+        a fraction of a second.
+
         Parameters
         ----------
         minimum: int, optional
             Minimum (inclusive) bound for random value.
         maximum: int, optional
             Maximum (inclusive) bound for random value.
+        density: float, optional
+            Probability of a cell not being ``minimum``. Other values are
+            equally likely. If not specified, all values between ``minimum``
+            and ``maximum`` are equally likely.
+        random_state: int, optional
+            Seed of the random generator. The same ``random_state`` always
+            yields the same matrix, independently of the global ``random``
+            module. If not specified, the generator is seeded randomly.
+        symmetry: str, optional
+            Symmetry of the matrix, one of ``SYMMETRIES``: ``C2`` is symmetric
+            under rotation by 180 degrees, ``C4`` under rotation by 90 degrees
+            and ``D8`` under all rotations and reflections of a square. ``C4``
+            and ``D8`` require a square matrix. Defaults to ``C1``, i.e. no
+            symmetry.
 
         Returns
         -------
         self
             Returns the matrix object to allow chaining.
 
+        Raises
+        ------
+        ValueError
+            If the symmetry is unknown or requires a square matrix.
+        ImportError
+            If the ``C4`` or ``D8`` symmetries are requested and NumPy is not
+            installed.
+
+        Notes
+        -----
+        Values are only equally likely if their amount divides ``256``, e.g.
+        for two-state cells. Otherwise, the probabilities of values differ by
+        less than ``1 / 256``. Densities are exact.
+
         Examples
         --------
         >>> matrix = Matrix(2)
@@ -421,9 +806,176 @@ class Matrix:
         0 1
         # random
 
+        Reproducible soup with 30% living cells, symmetric under rotations
+
+        >>> soup = Matrix(16).fill_random(density=0.3, random_state=42,
+        ...                               symmetry="C4")
+
         """
-        for y in range(self.height):
-            for x in range(self.width):
-                self[y][x] = random.randint(minimum, maximum)
+        symmetry = symmetry or "C1"
+        if symmetry not in SYMMETRIES:
+            raise ValueError(f"Unknown symmetry {symmetry}, use one of "
+                             f"{', '.join(SYMMETRIES)}")
+        if symmetry in ("C4", "D8") and self.width != self.height:
+            raise ValueError(f"{symmetry} symmetry requires a square matrix")
+
+        size = self.width * self.height
+        cells = _random_cells(random.Random(random_state), size, minimum,
+                              maximum, density)
+        cells = _symmetrize(cells, self.width, self.height, symmetry)
+
+        if isinstance(self.matrix, Grid) and len(self.matrix.cells) == size:
+            self.matrix.cells[:] = cells
+        else:
+            self.matrix = Grid(self.width, self.height, cells)
 
         return self
+
+
+@functools.lru_cache(maxsize=8)
+def neighbor_table(width: int, height: int, wrap: bool = False) -> array:
+    """Compute the flat indices of the neighbors of every cell of a grid.
+
+    Cells are indexed row by row, like the cells of a ``Grid``. Tables are
+    cached for every combination of size and edge handling, so rule functions
+    can look up neighbors without computing any coordinates.
+
+    Parameters
+    ----------
+    width, height: int
+        Width and height of the grid.
+    wrap: bool, optional
+        Whether to wrap around the edge of the grid. Defaults to ``False``.
+
+    Returns
+    -------
+    array
+        Array of ``8 * width * height`` indices. The neighbors of the cell at
+        index ``i`` are found at ``table[8 * i:8 * i + 8]``, in the order of
+        ``NEIGHBORS``. Neighbors outside of a grid that does not wrap have the
+        index ``-1``.
+
+    Examples
+    --------
+    Count the living neighbors of the cell at ``(x, y)``
+
+    >>> cells, table = grid.cells, neighbor_table(grid.width, grid.height)
+    >>> start = 8 * (y * grid.width + x)
+    >>> sum(cells[i] for i in table[start:start + 8] if i >= 0)
+
+    """
+    if np is not None:
+        return _vectorized_neighbor_table(width, height, wrap)
+
+    table = array("l")
+    columns, rows = _near(width, wrap), _near(height, wrap)
+
+    for y in range(height):
+        for x in range(width):
+            for dir_x, dir_y in NEIGHBORS:
+                new_x, inside_x = columns[x][dir_x + 1]
+                new_y, inside_y = rows[y][dir_y + 1]
+                table.append(new_y * width + new_x
+                             if inside_x and inside_y else -1)
+
+    return table
+
+
+def _vectorized_neighbor_table(width: int, height: int, wrap: bool) -> array:
+    """Compute ``neighbor_table`` for all cells at once using NumPy."""
+    ys, xs = np.divmod(np.arange(width * height), max(width, 1))
+    columns = []
+
+    for dir_x, dir_y in NEIGHBORS:
+        new_x, new_y = xs + dir_x, ys + dir_y
+        if wrap:
+            columns.append(new_y % height * width + new_x % width)
+        else:
+            inside = (new_x >= 0) & (new_x < width) & (new_y >= 0) \
+                & (new_y < height)
+            columns.append(np.where(inside, new_y * width + new_x, -1))
+
+    table = array("l")
+    table.frombytes(np.stack(columns, axis=1).astype(
+        np.dtype(f"i{table.itemsize}")).tobytes())
+    return table
+
+
+@functools.lru_cache(maxsize=64)
+def _near(length: int, wrap: bool) -> List[Tuple[Tuple[int, bool], ...]]:
+    """Positions next to every position of an axis and if they are inside."""
+    return [tuple(((pos % length if wrap else pos),
+                   wrap or 0 <= pos < length)
+                  for pos in (index - 1, index, index + 1))
+            for index in range(length)]
+
+
+def _random_cells(rng: random.Random, size: int, minimum: int, maximum: int,
+                  density: float = None) -> bytearray:
+    """Draw ``size`` random cells from one random byte each.
+
+    See ``Matrix.fill_random`` for the meaning of the arguments.
+    """
+    data = rng.getrandbits(8 * size).to_bytes(size, "little") if size else b""
+
+    values = maximum - minimum
+    if density is None or not values:
+        table = bytes(minimum + byte * (values + 1) // 256
+                      for byte in range(256))
+        return bytearray(data.translate(table))
+
+    # Bytes below the threshold are alive, the byte at the threshold is alive
+    # with the remaining fraction of the density
+    threshold = density * 256
+    whole = int(threshold)
+    table = bytes(minimum + 1 + byte * values // whole
+                  if byte < whole else minimum for byte in range(256))
+    cells = bytearray(data.translate(table))
+
+    if whole < 256:
+        fraction = threshold - whole
+        index = data.find(whole)
+        while index >= 0:
+            if rng.random() < fraction:
+                cells[index] = minimum + 1 + rng.randrange(values)
+            index = data.find(whole, index + 1)
+
+    return cells
+
+
+def _symmetrize(cells: bytearray, width: int, height: int,
+                symmetry: str) -> bytearray:
+    """Make cells symmetric by copying every cell to its images."""
+    if symmetry == "C1":
+        return cells
+
+    if symmetry == "C2":
+        # Rotating a grid by 180 degrees reverses its cells
+        half = (len(cells) + 1) // 2
+        return cells[:half] + cells[:len(cells) // 2][::-1]
+
+    if np is None:
+        raise ImportError(f"{symmetry} symmetry requires NumPy to be installed")
+
+    # Every cell takes the value of the first cell of its orbit, which lies
+    # between the diagonals in the upper half of the grid (C4), or in the
+    # left half of that wedge (D8). Only these cells are copied, all others
+    # are filled by taking the maximum of the grid and its mirror images.
+    grid = np.frombuffer(cells, dtype=np.uint8).reshape(height, width)
+    result = np.zeros_like(grid)
+    size, middle = width, (width + 1) // 2
+
+    for y in range(middle):
+        stop = size - 1 - y if symmetry == "C4" else middle
+        result[y, y:stop] = grid[y, y:stop]
+
+    if symmetry == "C4":
+        if size % 2:
+            result[middle - 1, middle - 1] = grid[middle - 1, middle - 1]
+        np.maximum(result, np.rot90(result), out=result)
+    else:
+        np.maximum(result, result[:, ::-1], out=result)
+        np.maximum(result, result.T, out=result)
+
+    np.maximum(result, result[::-1, ::-1], out=result)
+    return bytearray(result)
@@ -1,70 +1,198 @@
 """Parse Run Length Encoded files"""
-import math
+import functools
 import re
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 
-from .matrix import Matrix
+from .matrix import Grid
 
 Env = Dict[str, Any]
-Grid = List[List[int]]
+Run = Tuple[int, int, int, int]
 
 # https://pythex.org/?regex=(%5Bxy%5D)%5Cs%3F%3D%5Cs%3F(%5Cd%2B)&test_string=x%20%3D%201%2C%20y%20%3D%2034&ignorecase=0&multiline=0&dotall=0&verbose=0
 #: RegEx matching digits
 DIGIT_REG = re.compile(r"(-?\d+)")
 #: RegEx matching RLE first line
-FIRSTLINE_REG = re.compile(r"(x|y|rule)\s?=\s?(\w+\/?\w*)")
-#: RegEx matching RLE directives
-RLE_REG = re.compile(r"(\d+)?([bo])")
+FIRSTLINE_REG = re.compile(r"(x|y|rule)\s?=\s?([\w/]+)")
+#: RegEx matching RLE directives, including multi-state cells
+RLE_REG = re.compile(r"(\d+)?([bo.]|[p-y]?[A-X])")
+#: RegEx matching runs of cells and row ends, see ``parse_runs``
+RUN_REG = re.compile(r"(\d*)([bo.]|[p-y]?[A-X]|\$)")
+#: RegEx matching a run at the end of a chunk, continued in the next chunk
+PARTIAL_RUN_REG = re.compile(r"\d*[p-y]?\Z")
+#: Amount of characters read at once from RLE files
+CHUNK_SIZE = 1 << 16
 
 
-def seed_from_rle(env: Env) -> Matrix:
+def cell_state(cell: str) -> int:
+    """Get the state of an RLE cell.
+
+    Parameters
+    ----------
+    cell: str
+        RLE cell. Two-state patterns use ``b`` for dead and ``o`` for alive
+        cells. Multi-state patterns use ``.`` for dead cells and ``A`` to
+        ``X`` for states ``1`` to ``24``, prefixed with ``p`` to ``y`` for
+        higher states.
+
+    Returns
+    -------
+    int
+        State of the cell.
+
+    Examples
+    --------
+    >>> cell_state("o"), cell_state("B"), cell_state("pA")
+    (1, 2, 25)
+
+    """
+    if cell in "b.":
+        return 0
+    if cell == "o":
+        return 1
+
+    prefix = ord(cell[0]) - ord("p") + 1 if len(cell) > 1 else 0
+    return 24 * prefix + ord(cell[-1]) - ord("A") + 1
+
+
+#: Cells of multi-state patterns, see ``cell_state``
+CELLS = [*"b.o", *(prefix + cell for prefix in ["", *"pqrstuvwxy"]
+                   for cell in "ABCDEFGHIJKLMNOPQRSTUVWX")]
+#: States of all RLE cells
+STATES = {cell: cell_state(cell) for cell in CELLS}
+
+
+def parse_runs(chunks: Iterable[str]) -> Iterator[Run]:
+    """Decode the runs of RLE instructions in a single pass.
+
+    Instructions are decoded chunk by chunk, so only a single chunk is held in
+    memory at once. Runs may be split across chunks and lines.
+
+    Parameters
+    ----------
+    chunks: `iterable` [str]
+        RLE instructions, in chunks of any size. Decoding stops at the first
+        ``!``.
+
+    Returns
+    -------
+    `iterator` [`tuple` [int, int, int, int]]
+        Row, first column, length and state of every run of cells that are
+        not dead. ``N$`` row ends skip ``N - 1`` empty rows.
+
+    Raises
+    ------
+    ValueError
+        If the instructions end in the middle of a run, without a closing
+        ``!``.
+
+    Examples
+    --------
+    >>> list(parse_runs(["bo$2", "bo3$3o!"]))
+    [(0, 1, 1, 1), (1, 2, 1, 1), (4, 0, 3, 1)]
+
+    """
+    row = col = 0
+    partial = ""
+
+    for chunk in chunks:
+        body, end, _ = "".join(chunk.split()).partition("!")
+        body = partial + body
+
+        if not end:
+            partial = PARTIAL_RUN_REG.search(body).group()
+            body = body[:len(body) - len(partial)]
+
+        for amount, cell in RUN_REG.findall(body):
+            amount = int(amount) if amount else 1
+
+            if cell == "$":
+                row += amount
+                col = 0
+                continue
+
+            state = STATES[cell]
+            if state:
+                yield row, col, amount, state
+            col += amount
+
+        if end:
+            return
+
+    if partial:
+        raise ValueError(f"RLE instructions end in an incomplete run "
+                         f"{partial!r}")
+
+
+def seed_from_rle(env: Env, out: Any = None) -> Any:
     """Generate a Game of Life seed from an environment.
 
+    The RLE instructions are decoded by ``parse_runs`` and every run is
+    written straight into the seed using slice assignment, without building
+    any intermediate rows.
+
     Parameters
     ----------
     env: `dict` [str, `Any`]
         Environment dictionary generated by ``parse_file``.
+    out: `Any`, optional
+        Empty grid to write the seed into, e.g. a ``BitGrid`` or a NumPy array.
+        Grids providing a ``fill_run`` method (see ``Grid.fill_run``) are
+        written using it, other grids using ``out[row][start:stop] = cells``.
+        Cells outside of the grid are dropped. If not specified, a ``Grid`` of
+        the size of the pattern is used.
 
     Returns
     -------
-    `list` [`list` [int]]
+    `Any`
         Game of Life grid with ``0`` representing a dead cell and ``1``
-        representing a living cell.
+        representing a living cell. Multi-state patterns hold the state of
+        every cell.
+
+    Examples
+    --------
+    Decode a pattern into a bit-packed grid
+
+    >>> from pygol.game.engines.bitpacked import BitGrid
+    >>> env = parse_file("examples/rle/glider.rle")
+    >>> words = np.zeros((env["y"], -(-env["x"] // 64)), dtype=np.uint64)
+    >>> seed = seed_from_rle(env, BitGrid(words, env["x"]))
+
     """
-    grid = Matrix(env["x"], env["y"])
+    width, height = env["x"], env["y"]
 
     start_x, start_y = env["start"] if "start" in env else (0, 0)
     if start_x < 0:
-        grid.pad_left(abs(start_x))
+        width += abs(start_x)
         start_x = 0
 
     if start_y < 0:
-        grid.pad_top(abs(start_y))
+        height += abs(start_y)
         start_y = 0
 
-    for y in range(start_y, grid.height):
-        if len(env["rle"]) > 0:
-            line = parse_rle(env["rle"].pop(0))
-        else:
+    if out is None:
+        out = Grid(width, height)
+    else:
+        width, height = len(out[0]) if len(out) else 0, len(out)
+
+    if hasattr(out, "fill_run"):
+        fill_run = out.fill_run
+    else:
+        def fill_run(row: int, start: int, stop: int, state: int) -> None:
+            out[row][start:stop] = [state] * (stop - start)
+
+    rle = env["rle"]
+    for row, col, amount, state in parse_runs([rle] if isinstance(rle, str)
+                                              else rle):
+        row += start_y
+        if row >= height:
             break
 
-        for x in range(start_x, grid.width):
-            if len(line) > 0:
-                amount, cell = line[0]
-            else:
-                continue
-
-            grid[y][x] = 0 if cell == "b" else 1
-            amount -= 1
+        start = start_x + col
+        stop = start + amount if start + amount < width else width
+        if start < stop:
+            fill_run(row, start, stop, state)
 
-            if amount <= 0:
-                line.pop(0)
-                if len(line) == 0:
-                    line.append((math.inf, "b"))
-            else:
-                line[0] = amount, cell
-
-    return grid.matrix
+    return out
 
 
 def parse_comment(comment: str, env: Env) -> None:
@@ -140,6 +268,8 @@ def parse_rle(rle: str) -> List[Tuple[int, str]]:
     --------
     >>> parse_rle("bo$2bo$3o!")
     [(1, 'b'), (1, 'o'), (2, 'b'), (1, 'o'), (3, 'o')]
+    >>> parse_rle(".2AB")
+    [(1, '.'), (2, 'A'), (1, 'B')]
 
     """
     steps = RLE_REG.findall(rle)
@@ -156,6 +286,10 @@ def parse_rle(rle: str) -> List[Tuple[int, str]]:
 def parse_file(path: str) -> Env:
     """Parse RLE files.
 
+    Only comments and the header are read. The RLE instructions are read
+    lazily, in chunks of ``CHUNK_SIZE`` characters, when the seed is decoded
+    by ``seed_from_rle``.
+
     Parameters
     ----------
     path: str
@@ -164,37 +298,53 @@ def parse_file(path: str) -> Env:
     Returns
     -------
     env: `dict` [str, `Any`]
-        Environment dict containing parsed RLE information.
+        Environment dict containing parsed RLE information. The RLE
+        instructions are stored as an iterator of chunks in ``rle``.
     """
     env = {
         "rule": "B3/S23",  # Standard Conway's Game of Life rule
         "start": (0, 0),
-        "rle": ""
     }
-    is_firstline = True
 
-    with open(path) as file:
-        for line in file:
+    with open(path, encoding="utf-8") as file:
+        for line in iter(file.readline, ""):
             line = line.rstrip()
 
             if line.startswith("#"):
                 parse_comment(line, env)
-            else:
-                if is_firstline:
-                    is_firstline = False
-                    parse_header(line, env)
-                else:
-                    # Handle RLE
-                    if line.endswith("!"):
-                        env["rle"] += line[:-1]
-                        env["rle"] = env["rle"].split("$")
-                        break
-
-                    env["rle"] += line
+            elif line:
+                parse_header(line, env)
+                break
+
+        env["rle"] = read_chunks(path, file.tell())
 
     return env
 
 
+def read_chunks(path: str, offset: int = 0,
+                size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Lazily read a text file in chunks.
+
+    Parameters
+    ----------
+    path: str
+        Path to the file.
+    offset: int, optional
+        Position to start reading at, as returned by ``file.tell()``.
+        Defaults to the start of the file.
+    size: int, optional
+        Amount of characters per chunk. Defaults to ``CHUNK_SIZE``.
+
+    Returns
+    -------
+    `iterator` [str]
+        Chunks of the file.
+    """
+    with open(path, encoding="utf-8") as file:
+        file.seek(offset)
+        yield from iter(functools.partial(file.read, size), "")
+
+
 def user_env(env: Env) -> Env:
     """Generate a user environment from an environment dict.
 
@@ -223,9 +373,10 @@ def user_env(env: Env) -> Env:
     """
     seed = seed_from_rle(env)
 
+    # The seed grows beyond the size of the pattern if it has a start offset
     return {
-        "width": env["x"],
-        "height": env["y"],
+        "width": len(seed[0]) if seed else env["x"],
+        "height": len(seed),
         "rule": env["rule"],
         "seed": seed
     }
@@ -0,0 +1,172 @@
+"""Text rendering of grids"""
+from typing import List, Optional, Sequence, Tuple, Union
+
+#: Maximum amount of multi-byte texts rendered by replacing stand-in bytes
+MAX_STAND_INS = 8
+
+Cells = Union[bytes, bytearray, memoryview]
+
+
+class TextRenderer:
+    """Render grids of ``uint8`` cells as text, one line per row.
+
+    Every state is rendered using a fixed text. Rows are encoded from the raw
+    cells using ``bytes.translate``: if the texts of all states encode to the
+    same amount of bytes, every byte of the texts is translated separately and
+    interleaved using slice assignment. Otherwise, multi-byte texts are
+    translated to stand-in bytes, which are then replaced by the texts. Rows
+    are only joined text by text if there are too many multi-byte texts.
+
+    The encoded rows of the last rendered grid are cached along with their
+    cells, so rows that did not change since the last frame are not encoded
+    again, and a frame that did not change at all is not even split into
+    rows.
+
+    Parameters
+    ----------
+    texts: `sequence` [str]
+        Texts representing the states, indexed by state. States without a text
+        are rendered like state ``0``.
+
+    Examples
+    --------
+    >>> renderer = TextRenderer([" ", "•"])
+    >>> print(renderer.render(bytes([0, 1, 1, 1]), 2, 2), end="")
+     •
+    ••
+
+    """
+
+    def __init__(self, texts: Sequence[str]):
+        codes = [text.encode() for text in texts]
+        self.codes = codes + [codes[0]] * (256 - len(codes))
+        # Translation tables and replaced stand-ins used to encode rows
+        self._tables: List[bytes] = []
+        self._stand_ins: List[Tuple[bytes, bytes]] = []
+        # Cells of the last rendered grid, and its rows as cells, encoded
+        # lines and decoded text
+        self._frame: Tuple[bytes, int] = (b"", 0)
+        self._rows: List[bytes] = []
+        self._lines: List[bytes] = []
+        self._texts: List[Optional[str]] = []
+
+        sizes = {len(code) for code in self.codes}
+        if len(sizes) == 1 and 0 not in sizes:
+            self._tables = [bytes(code[index] for code in self.codes)
+                            for index in range(sizes.pop())]
+            return
+
+        used = set(b"".join(self.codes)) | {ord("\n")}
+        free = [byte for byte in range(256) if byte not in used]
+        texts = sorted({code for code in self.codes if len(code) != 1})
+
+        if len(texts) <= min(len(free), MAX_STAND_INS):
+            stand_ins = dict(zip(texts, free))
+            self._tables = [bytes(stand_ins[code] if code in stand_ins
+                                  else code[0] for code in self.codes)]
+            self._stand_ins = [(bytes([byte]), code)
+                               for code, byte in stand_ins.items()]
+
+    def render(self, cells: Cells, width: int, height: int) -> str:
+        """Render a grid.
+
+        Parameters
+        ----------
+        cells: `bytes-like`
+            Cells of the grid, row by row.
+        width, height: int
+            Width and height of the grid.
+
+        Returns
+        -------
+        str
+            Text of the grid, with every row ending in a newline.
+        """
+        lines, texts = self.lines(cells, width, height), self._texts
+
+        for y, text in enumerate(texts):
+            if text is None:
+                texts[y] = lines[y].decode()
+
+        return "".join(texts)
+
+    def render_into(self, cells: Cells, width: int, height: int,
+                    out: bytearray, offset: int = 0) -> int:
+        """Render a grid into a buffer, without building the text in between.
+
+        Parameters
+        ----------
+        cells: `bytes-like`
+            Cells of the grid, row by row.
+        width, height: int
+            Width and height of the grid.
+        out: bytearray
+            Buffer receiving the UTF-8 encoded text of the grid. It is grown if
+            it is too small, so it can be reused for every frame.
+        offset: int, optional
+            Position in ``out`` to write the text to. Defaults to ``0``.
+
+        Returns
+        -------
+        int
+            Amount of bytes written.
+        """
+        text = b"".join(self.lines(cells, width, height))
+        out[offset:offset + len(text)] = text
+        return len(text)
+
+    def lines(self, cells: Cells, width: int, height: int) -> List[bytes]:
+        """Encode the rows of a grid, reusing the rows of the last grid.
+
+        Parameters
+        ----------
+        cells: `bytes-like`
+            Cells of the grid, row by row.
+        width, height: int
+            Width and height of the grid.
+
+        Returns
+        -------
+        `list` [bytes]
+            UTF-8 encoded text of every row, ending in a newline. The list is
+            reused by the next call.
+        """
+        rows, lines, texts = self._rows, self._lines, self._texts
+        if len(rows) == height and self._frame == (cells, width):
+            return lines
+
+        cells = bytes(cells)
+        self._frame = (cells, width)
+        if len(rows) != height:
+            rows[:] = [None] * height
+            lines[:] = [b""] * height
+            texts[:] = [None] * height
+
+        for y in range(height):
+            row = cells[y * width:(y + 1) * width]
+            if row != rows[y]:
+                rows[y] = row
+                lines[y] = self._encode(row)
+                texts[y] = None
+
+        return lines
+
+    def _encode(self, row: bytes) -> bytes:
+        """Encode the text of a row of cells."""
+        tables = self._tables
+
+        if not tables:
+            return b"".join(map(self.codes.__getitem__, row)) + b"\n"
+
+        if len(tables) == 1:
+            line = row.translate(tables[0])
+            for stand_in, code in self._stand_ins:
+                line = line.replace(stand_in, code)
+            return line + b"\n"
+
+        size = len(tables)
+        line = bytearray(len(row) * size + 1)
+        for index, table in enumerate(tables):
+            line[index:-1:size] = row.translate(table)
+        line[-1] = ord("\n")
+        return line